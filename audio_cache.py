@@ -0,0 +1,171 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_chunk_text(text: str) -> str:
+    """Collapse whitespace so cosmetic edits map to the same cache entry."""
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def cache_key(text: str, voice: str, prosody_rate: str, output_format: str) -> str:
+    """Content address for one synthesized chunk."""
+    parts = (normalize_chunk_text(text), voice or "", prosody_rate or "", output_format or "")
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class AudioChunkCache:
+    """Two-tier (memory LRU + disk) cache of synthesized chunk audio.
+
+    Each tier has its own byte budget; least recently used entries are evicted
+    first. A budget of 0 disables that tier. Safe to call from worker threads.
+    """
+
+    def __init__(self, memory_bytes: int, disk_bytes: int, disk_dir: Optional[str] = None, suffix: str = ".mp3"):
+        self.memory_bytes = max(0, memory_bytes)
+        self.disk_bytes = max(0, disk_bytes)
+        self.suffix = suffix
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+        self._counters: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        if self.disk_dir is not None and self.disk_bytes > 0:
+            self._load_disk_index()
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}{self.suffix}"
+
+    def _load_disk_index(self) -> None:
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for path in self.disk_dir.glob(f"*{self.suffix}"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.name[: -len(self.suffix)], stat.st_size))
+        except OSError:
+            self.disk_dir = None
+            return
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+        self._evict_disk()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self._counters["memory_evictions"] += 1
+
+    def _evict_disk(self) -> None:
+        while self._disk_size > self.disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self._counters["disk_evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for `key`, or None on a miss."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return data
+            on_disk = self.disk_dir is not None and key in self._disk
+
+        if on_disk:
+            try:
+                data = self._path(key).read_bytes()
+            except OSError:
+                data = None
+            with self._lock:
+                if data is None:
+                    size = self._disk.pop(key, None)
+                    if size is not None:
+                        self._disk_size -= size
+                else:
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self._counters["disk_hits"] += 1
+                    self._remember(key, data)
+                    return data
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def contains(self, key: str) -> bool:
+        """Whether `key` is cached in either tier (does not count as a hit)."""
+        with self._lock:
+            return key in self._memory or (self.disk_dir is not None and key in self._disk)
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store complete chunk audio under `key` in both tiers."""
+        if not data:
+            return
+        with self._lock:
+            self._counters["stores"] += 1
+            self._remember(key, data)
+            write_disk = self.disk_dir is not None and len(data) <= self.disk_bytes and key not in self._disk
+
+        if not write_disk:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.disk_dir), suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if key not in self._disk:
+                self._disk[key] = len(data)
+                self._disk_size += len(data)
+            self._evict_disk()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "memory_budget_bytes": self.memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_size,
+                "disk_budget_bytes": self.disk_bytes if self.disk_dir is not None else 0,
+            }
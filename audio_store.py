@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import BinaryIO, Optional
+
+from mp3_index import Mp3Index
+
+
+@dataclass
+class StoredAudio:
+    """A rendered audio file spooled to disk. Immutable once committed."""
+
+    path: str
+    media_type: str
+    filename: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    size: int = 0
+    created_at: float = field(default_factory=time.time)
+    file: Optional[BinaryIO] = None
+    index: Optional[Mp3Index] = None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.id}-{self.size}"'
+
+    @property
+    def url(self) -> str:
+        return f"/audio/{self.id}"
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.size += len(data)
+
+
+class AudioStore:
+    """Spool directory for rendered audio, served later by id.
+
+    Files are written incrementally (`create` -> `write` -> `commit`), so a
+    render never holds the whole output in memory. Committed files expire after
+    `ttl_seconds`; the oldest are removed first when over `max_bytes`.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_bytes: int = 1024 * 1024 * 1024, spool_dir: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.spool_dir = spool_dir
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, StoredAudio]" = OrderedDict()
+        self._size = 0
+
+    def create(self, media_type: str, filename: str) -> StoredAudio:
+        """Open a new spool file for writing."""
+        if self.spool_dir:
+            os.makedirs(self.spool_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1], dir=self.spool_dir)
+        return StoredAudio(path=path, media_type=media_type, filename=filename, file=os.fdopen(fd, "wb"))
+
+    def commit(self, entry: StoredAudio) -> StoredAudio:
+        """Close `entry` and make it available through `get`."""
+        if entry.file is not None:
+            entry.file.close()
+            entry.file = None
+        entry.size = os.path.getsize(entry.path)
+        with self._lock:
+            self._entries[entry.id] = entry
+            self._size += entry.size
+        self.purge()
+        return entry
+
+    def discard(self, entry: StoredAudio) -> None:
+        """Drop an entry (committed or not) and delete its file."""
+        if entry.file is not None:
+            entry.file.close()
+            entry.file = None
+        with self._lock:
+            if self._entries.pop(entry.id, None) is not None:
+                self._size -= entry.size
+        self._remove(entry.path)
+
+    def get(self, audio_id: str) -> Optional[StoredAudio]:
+        self.purge()
+        with self._lock:
+            return self._entries.get(audio_id)
+
+    def purge(self) -> None:
+        """Remove expired entries, then the oldest ones until under budget."""
+        expired = []
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            # entries are in commit order, which need not follow `created_at`: check them all
+            for audio_id, entry in list(self._entries.items()):
+                if entry.created_at <= cutoff:
+                    self._entries.pop(audio_id)
+                    self._size -= entry.size
+                    expired.append(entry.path)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, entry = self._entries.popitem(last=False)
+                self._size -= entry.size
+                expired.append(entry.path)
+        for path in expired:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
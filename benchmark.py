@@ -0,0 +1,306 @@
+"""Load and latency benchmark for the app against the offline TTS stand-in.
+
+Starts `mock_tts_server.py` and the app (uvicorn, `TTS_BACKEND=local`) on free
+ports, drives `/estimate`, `/synthesize` and `/synthesize_stream` with N
+concurrent clients for each script size, and writes TTFB and total latency
+percentiles, throughput and the app's peak RSS as JSON.
+
+    python benchmark.py --clients 1 4 16 --words 200 2000 --requests 4
+    python benchmark.py --compare bench/bench-before.json -o bench/bench-after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from latency import LatencyWindow
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ENDPOINTS = ("/estimate", "/synthesize", "/synthesize_stream")
+PERCENTILES = (50, 90, 95, 99)
+
+WORDS = (
+    "we measure the latency of every stage so the slowest one stands out and the talk "
+    "keeps its pace while slides change and the audience follows each point clearly"
+).split()
+
+
+def make_script(words: int, seed: int = 0) -> str:
+    """Deterministic script of about `words` words: sentences of 8-20 words, a slide marker every ~60."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    count = 0
+    slide = 1
+    while count < words:
+        if count // 60 + 1 >= slide:
+            parts.append(f"Slide {slide}")
+            slide += 1
+        n = min(rng.randint(8, 20), words - count)
+        sentence = " ".join(rng.choice(WORDS) for _ in range(n))
+        parts.append(sentence.capitalize() + ".")
+        count += n
+    return " ".join(parts)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_bytes(pid: int) -> Optional[int]:
+    """Peak resident set size of a running process (Linux /proc), else None."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def children_peak_rss_bytes() -> Optional[int]:
+    """Largest peak RSS among waited-for child processes (getrusage fallback; None on Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(url) as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not become ready")
+            await asyncio.sleep(0.1)
+
+
+async def timed_request(session: aiohttp.ClientSession, url: str, form: Dict[str, str]) -> dict:
+    """One POST: status, time to first body byte, total time and body size."""
+    started = time.perf_counter()
+    ttfb = None
+    size = 0
+    async with session.post(url, data=form) as resp:
+        async for data in resp.content.iter_any():
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+            size += len(data)
+        status = resp.status
+    total = time.perf_counter() - started
+    return {"status": status, "ttfb": total if ttfb is None else ttfb, "total": total, "bytes": size}
+
+
+async def run_scenario(base_url: str, endpoint: str, words: int, clients: int, requests: int) -> dict:
+    """`clients` concurrent clients each sending `requests` requests back to back."""
+    script = make_script(words)
+    samples: List[dict] = []
+    timeout = aiohttp.ClientTimeout(total=None)
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        for _ in range(requests):
+            try:
+                samples.append(await timed_request(session, base_url + endpoint, {"text": script}))
+            except aiohttp.ClientError:
+                samples.append({"status": 0, "ttfb": 0.0, "total": 0.0, "bytes": 0})
+
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    ok = [s for s in samples if s["status"] == 200]
+    ttfb = LatencyWindow(max_samples=max(1, len(ok)))
+    total = LatencyWindow(max_samples=max(1, len(ok)))
+    for sample in ok:
+        ttfb.add(sample["ttfb"])
+        total.add(sample["total"])
+    sent = sum(s["bytes"] for s in ok)
+    return {
+        "endpoint": endpoint,
+        "script_words": words,
+        "clients": clients,
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "ttfb_ms": percentiles_ms(ttfb),
+        "total_ms": percentiles_ms(total),
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(ok) / elapsed, 3),
+        "bytes": sent,
+        "throughput_bytes_per_second": round(sent / elapsed, 1),
+    }
+
+
+def percentiles_ms(window: LatencyWindow) -> Dict[str, Optional[float]]:
+    result = {}
+    for pct in PERCENTILES:
+        value = window.percentile(pct)
+        result[f"p{pct}"] = None if value is None else round(value * 1000.0, 1)
+    return result
+
+
+def scenario_key(result: dict) -> tuple:
+    return result["endpoint"], result["script_words"], result["clients"]
+
+
+def compare(previous: dict, current: dict) -> List[str]:
+    """One line per scenario present in both runs: p50/p95 total latency and throughput change."""
+    before = {scenario_key(r): r for r in previous.get("results", [])}
+    lines = []
+    for result in current["results"]:
+        old = before.get(scenario_key(result))
+        if old is None:
+            continue
+        changes = []
+        for label, a, b in (
+            ("p50", old["total_ms"]["p50"], result["total_ms"]["p50"]),
+            ("p95", old["total_ms"]["p95"], result["total_ms"]["p95"]),
+            ("bytes/s", old["throughput_bytes_per_second"], result["throughput_bytes_per_second"]),
+        ):
+            if a and b is not None:
+                changes.append(f"{label} {a:g} -> {b:g} ({(b - a) / a * 100.0:+.1f}%)")
+        endpoint, words, clients = scenario_key(result)
+        lines.append(f"{endpoint} words={words} clients={clients}: " + ", ".join(changes))
+    return lines
+
+
+async def run(args: argparse.Namespace) -> dict:
+    mock_port, app_port = free_port(), free_port()
+    cache_dir = tempfile.mkdtemp(prefix="practicetalk-bench-")
+    env = {
+        **os.environ,
+        "TTS_BACKEND": "local",
+        "TTS_LOCAL_URL": f"ws://127.0.0.1:{mock_port}/tts",
+        "AUDIO_CACHE_DIR": cache_dir,
+        "UPSTREAM_MAX_QUEUED": str(args.max_queued),
+    }
+    if not args.cache:
+        # every request synthesizes, so upstream and pipeline costs are measured each time
+        env.update(AUDIO_CACHE_MEMORY_MB="0", AUDIO_CACHE_DISK_MB="0", WORD_CACHE_MEMORY_MB="0", WORD_CACHE_DISK_MB="0")
+    mock = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT, "mock_tts_server.py"),
+            "--port", str(mock_port),
+            "--latency-ms", str(args.mock_latency_ms),
+            "--jitter-ms", str(args.mock_jitter_ms),
+            "--realtime-factor", str(args.mock_realtime_factor),
+            "--drop-rate", str(args.mock_drop_rate),
+            "--stall-rate", str(args.mock_stall_rate),
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(app_port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{app_port}"
+    results = []
+    peak_rss = None
+    try:
+        await wait_ready(base_url + "/cache/stats")
+        for words in args.words:
+            for endpoint in args.endpoints:
+                for clients in args.clients:
+                    result = await run_scenario(base_url, endpoint, words, clients, args.requests)
+                    print(
+                        f"{endpoint:<20} words={words:<6} clients={clients:<4} "
+                        f"ttfb p50={result['ttfb_ms']['p50']}ms total p95={result['total_ms']['p95']}ms "
+                        f"errors={result['errors']}",
+                        file=sys.stderr,
+                    )
+                    results.append(result)
+        peak_rss = peak_rss_bytes(app.pid)
+    finally:
+        app.terminate()
+        mock.terminate()
+        app.wait()
+        mock.wait()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    if peak_rss is None:
+        peak_rss = children_peak_rss_bytes()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "requests_per_client": args.requests,
+            "cache": args.cache,
+            "mock": {
+                "latency_ms": args.mock_latency_ms,
+                "jitter_ms": args.mock_jitter_ms,
+                "realtime_factor": args.mock_realtime_factor,
+                "drop_rate": args.mock_drop_rate,
+                "stall_rate": args.mock_stall_rate,
+            },
+        },
+        "peak_rss_bytes": peak_rss,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=ENDPOINTS)
+    parser.add_argument("--clients", nargs="+", type=int, default=[1, 4, 16], help="concurrent clients per scenario")
+    parser.add_argument("--words", nargs="+", type=int, default=[200, 2000], help="script sizes in words")
+    parser.add_argument("--requests", type=int, default=4, help="requests per client")
+    parser.add_argument("--cache", action="store_true", help="keep the chunk caches on (repeat requests hit them)")
+    parser.add_argument("--max-queued", type=int, default=10_000, help="UPSTREAM_MAX_QUEUED for the app")
+    parser.add_argument("--mock-latency-ms", type=float, default=200.0)
+    parser.add_argument("--mock-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--mock-realtime-factor", type=float, default=20.0, help="mock throughput: audio seconds per second")
+    parser.add_argument("--mock-drop-rate", type=float, default=0.0, help="share of upstream turns that fail mid-audio")
+    parser.add_argument("--mock-stall-rate", type=float, default=0.0, help="share of upstream turns that stall")
+    parser.add_argument("-o", "--output", help="write results JSON here (default: bench/bench-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = args.output or os.path.join("bench", f"bench-{report['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"wrote {output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            for line in compare(json.load(fh), report):
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import json
+import struct
+from typing import Dict, Iterable, List, Optional
+
+TICKS_PER_SECOND = 10_000_000
+
+# a cue ends after this many words, or at a pause of at least CUE_MAX_GAP seconds
+CUE_MAX_WORDS = 8
+CUE_MAX_GAP = 0.5
+
+# timed stream framing: 1-byte kind, 4-byte big-endian payload length, payload
+FRAME_AUDIO = 1
+FRAME_WORD = 2
+FRAME_HEADER = struct.Struct(">BI")
+
+
+def boundary_to_word(event: dict) -> List[object]:
+    """Compact cacheable form of an upstream boundary event: [offset, duration, text] in ticks."""
+    return [event["offset"], event["duration"], event["text"]]
+
+
+def timed_word(word: List[object], base_seconds: float) -> Dict[str, object]:
+    """A cached word placed on the output timeline (chunk audio starts at `base_seconds`)."""
+    offset, duration, text = word
+    start = base_seconds + offset / TICKS_PER_SECOND
+    return {"text": text, "start": round(start, 3), "end": round(start + duration / TICKS_PER_SECOND, 3)}
+
+
+def first_word_at(text: str, position: int, words: List[Dict[str, object]]) -> Optional[Dict[str, object]]:
+    """The first of `words` (spoken in order) that starts at or after `position` in `text`.
+
+    Words are matched left to right; a word not found in `text` (e.g.
+    normalized by the voice) is skipped. None when no word is placed there.
+    """
+    cursor = 0
+    for word in words:
+        pos = text.find(word["text"], cursor) if word["text"] else -1
+        if pos < 0:
+            continue
+        if pos >= position:
+            return word
+        cursor = pos + len(word["text"])
+    return None
+
+
+def encode_frame(kind: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_word_frame(word: Dict[str, object]) -> bytes:
+    return encode_frame(FRAME_WORD, json.dumps(word, ensure_ascii=False).encode("utf-8"))
+
+
+def caption_cues(words: Iterable[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Group timed words into caption cues."""
+    cues: List[Dict[str, object]] = []
+    current: List[Dict[str, object]] = []
+    for word in words:
+        if current and (len(current) >= CUE_MAX_WORDS or word["start"] - current[-1]["end"] >= CUE_MAX_GAP):
+            cues.append(_cue(current))
+            current = []
+        current.append(word)
+    if current:
+        cues.append(_cue(current))
+    return cues
+
+
+def _cue(words: List[Dict[str, object]]) -> Dict[str, object]:
+    return {"start": words[0]["start"], "end": words[-1]["end"], "text": " ".join(w["text"] for w in words)}
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def to_vtt(words: Iterable[Dict[str, object]]) -> str:
+    lines = ["WEBVTT", ""]
+    for cue in caption_cues(words):
+        lines += [f"{_timestamp(cue['start'], '.')} --> {_timestamp(cue['end'], '.')}", cue["text"], ""]
+    return "\n".join(lines)
+
+
+def to_srt(words: Iterable[Dict[str, object]]) -> str:
+    lines: List[str] = []
+    for i, cue in enumerate(caption_cues(words), start=1):
+        lines += [str(i), f"{_timestamp(cue['start'], ',')} --> {_timestamp(cue['end'], ',')}", cue["text"], ""]
+    return "\n".join(lines)
@@ -1,26 +1,98 @@
+import time
+
+# taken before anything else is imported, so the profile covers the launcher's own imports
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import platform
 import socket
+import sys
 import threading
-import time
+import urllib.request
 import webbrowser
 import tkinter as tk
-
-import uvicorn
-
-from main import app
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
 
 HOST = "127.0.0.1"
-PORT = 8000
-URL = f"http://{HOST}:{PORT}"
+# preferred port (the browser keeps UI settings per origin); a free one is used when it is taken
+PORT = int(os.getenv("PRACTICETALK_PORT", 8000))
 
 
-def is_port_open(host: str, port: int) -> bool:
+class StartupProfile:
+    """Cold-start timings: milestones since process start and the cost of each heavy import."""
+
+    def __init__(self) -> None:
+        self.marks: Dict[str, float] = {}
+        self.imports: Dict[str, float] = {}
+        self.details: Dict[str, object] = {}
+
+    def mark(self, name: str) -> None:
+        self.marks.setdefault(name, round(time.perf_counter() - PROCESS_STARTED, 4))
+
+    @contextmanager
+    def timed_import(self, module: str) -> Iterator[None]:
+        started = time.perf_counter()
+        yield
+        self.imports[module] = round(time.perf_counter() - started, 4)
+
+    def report(self) -> dict:
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "executable": sys.executable,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seconds_since_start": self.marks,
+            "import_seconds": self.imports,
+            **self.details,
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(), fh, indent=2)
+
+
+def is_practicetalk(host: str, port: int) -> bool:
+    """True when our server already answers on the port (not just anything listening)."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.settimeout(0.25)
-        return sock.connect_ex((host, port)) == 0
+        if sock.connect_ex((host, port)) != 0:
+            return False
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/health", timeout=0.5) as resp:
+            return json.load(resp).get("app") == "PracticeTalk"
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Listening socket on `port`, or on a free port when it is taken."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if sys.platform != "win32":
+        # as uvicorn does; on Windows this option would let two servers share the port
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind((host, port))
+    except OSError:
+        sock.bind((host, 0))
+    return sock
 
 
 class PracticeTalkDesktop:
-    def __init__(self) -> None:
+    """Shows the window first; imports and starts the server on a background thread.
+
+    Readiness comes from uvicorn's own startup state (`Server.started`),
+    checked from the Tk loop, and warmup progress from `main.WARMUP_STATE`.
+    """
+
+    def __init__(self, profile: StartupProfile, profile_path: Optional[str] = None, exit_after_startup: bool = False) -> None:
+        self.profile = profile
+        self.profile_path = profile_path
+        self.exit_after_startup = exit_after_startup
+
         self.root = tk.Tk()
         self.root.title("PracticeTalk")
         self.root.geometry("380x170")
@@ -28,12 +100,17 @@ class PracticeTalkDesktop:
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.status_var = tk.StringVar(value="Starting local server...")
+        self.url: Optional[str] = None
         self.server = None
-        self.server_thread = None
+        self.server_thread: Optional[threading.Thread] = None
+        self.reused_server = False
+        self.error: Optional[BaseException] = None
         self.opened_browser = False
-        self.poll_count = 0
+        self.closing = False
 
         self._build_ui()
+        self.root.update_idletasks()
+        self.profile.mark("window_shown")
         self._start_server()
 
     def _build_ui(self) -> None:
@@ -50,35 +127,95 @@ class PracticeTalkDesktop:
         tk.Button(button_row, text="Quit", command=self.on_close, width=12).pack(side="left", padx=(10, 0))
 
     def _start_server(self) -> None:
-        if is_port_open(HOST, PORT):
-            self.status_var.set(f"Server already running at {URL}")
+        self.server_thread = threading.Thread(target=self._serve, daemon=True)
+        self.server_thread.start()
+        self.root.after(20, self._watch_startup)
+
+    def _serve(self) -> None:
+        """Server thread: reuse a running PracticeTalk, else import the app and run it."""
+        try:
+            if is_practicetalk(HOST, PORT):
+                self.url = f"http://{HOST}:{PORT}"
+                self.reused_server = True
+                return
+
+            # the heavy part of a cold start; timed one by one for the profile
+            with self.profile.timed_import("fastapi"):
+                import fastapi  # noqa: F401
+            with self.profile.timed_import("aiohttp"):
+                import aiohttp  # noqa: F401
+            with self.profile.timed_import("edge_tts"):
+                import edge_tts  # noqa: F401
+            with self.profile.timed_import("uvicorn"):
+                import uvicorn
+            with self.profile.timed_import("main"):
+                from main import app
+            self.profile.mark("imports_done")
+
+            sock = bind_socket(HOST, PORT)
+            self.url = f"http://{HOST}:{sock.getsockname()[1]}"
+            server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+            self.server = server
+            if self.closing:
+                return
+            server.run(sockets=[sock])
+        except BaseException as exc:  # includes SystemExit from a failed uvicorn startup
+            self.error = exc
+
+    def _watch_startup(self) -> None:
+        if self.closing:
+            return
+        if self.reused_server:
+            self.status_var.set(f"Server already running at {self.url}")
+            self.profile.details["reused_server"] = True
             self.open_app()
+            self._startup_finished()
             return
-
-        config = uvicorn.Config(app, host=HOST, port=PORT, log_level="warning")
-        self.server = uvicorn.Server(config)
-        self.server_thread = threading.Thread(target=self.server.run, daemon=True)
-        self.server_thread.start()
-        self.root.after(150, self._poll_server)
-
-    def _poll_server(self) -> None:
-        if is_port_open(HOST, PORT):
-            self.status_var.set(f"Running at {URL}")
+        if self.server is not None and self.server.started:
+            self.profile.mark("server_ready")
+            self.status_var.set(f"Running at {self.url}")
             self.open_app()
+            self.root.after(50, self._watch_warmup)
             return
-
-        self.poll_count += 1
-        if self.poll_count >= 80:
+        if self.error is not None or not self.server_thread.is_alive():
             self.status_var.set("Server failed to start. Close and try again.")
+            self.profile.details["error"] = repr(self.error)
+            self._startup_finished()
             return
-        self.root.after(150, self._poll_server)
+        self.root.after(20, self._watch_startup)
+
+    def _watch_warmup(self) -> None:
+        if self.closing:
+            return
+        state = getattr(sys.modules.get("main"), "WARMUP_STATE", None)
+        if state is None or state["done"]:
+            self.profile.mark("warmup_done")
+            self.profile.details["warmup"] = state
+            self._startup_finished()
+            return
+        self.root.after(50, self._watch_warmup)
+
+    def _startup_finished(self) -> None:
+        self.profile.details["url"] = self.url
+        if self.profile_path:
+            try:
+                self.profile.write(self.profile_path)
+            except OSError:
+                pass
+        if self.exit_after_startup:
+            self.on_close()
 
     def open_app(self) -> None:
+        if self.url is None:
+            return
         if not self.opened_browser:
-            webbrowser.open(URL)
+            if not self.exit_after_startup:
+                webbrowser.open(self.url)
+            self.profile.mark("browser_opened")
             self.opened_browser = True
 
     def on_close(self) -> None:
+        self.closing = True
         if self.server is not None:
             self.server.should_exit = True
             if self.server_thread is not None and self.server_thread.is_alive():
@@ -90,7 +227,24 @@ class PracticeTalkDesktop:
 
 
 def main() -> None:
-    PracticeTalkDesktop().run()
+    parser = argparse.ArgumentParser(description="PracticeTalk desktop launcher")
+    parser.add_argument(
+        "--profile",
+        default=os.getenv("PRACTICETALK_PROFILE"),
+        help="write a JSON startup profile (import and startup timings) here",
+    )
+    parser.add_argument(
+        "--exit-after-startup",
+        action="store_true",
+        help="quit once the server is warm (with --profile, measures a cold start)",
+    )
+    # the macOS app launcher may pass its own arguments (e.g. -psn_...)
+    args, _ = parser.parse_known_args()
+
+    # main reads this at import: warm the voice catalog and an upstream connection after startup
+    os.environ.setdefault("TTS_WARMUP", "1")
+    profile = StartupProfile()
+    PracticeTalkDesktop(profile, profile_path=args.profile, exit_after_startup=args.exit_after_startup).run()
 
 
 if __name__ == "__main__":
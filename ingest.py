@@ -0,0 +1,113 @@
+import asyncio
+import codecs
+import tempfile
+from typing import AsyncIterator, Optional
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from text_analysis import StreamingChunker
+
+
+class RequestBodySpool:
+    """Reads a request body into a temporary file as fast as the client sends it.
+
+    Owning `receive` means a client disconnect is noticed at any time, while
+    readers consume the body at their own pace without holding it in memory.
+    """
+
+    def __init__(self, receive: Receive):
+        self._receive = receive
+        self._file = tempfile.TemporaryFile()
+        self._size = 0
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Future] = None
+        self.complete = False
+        self.disconnected = asyncio.Event()
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._pump())
+
+    async def _pump(self) -> None:
+        try:
+            while True:
+                message = await self._receive()
+                if message["type"] == "http.disconnect":
+                    self.disconnected.set()
+                    return
+                body = message.get("body", b"")
+                if body:
+                    self._file.seek(0, 2)
+                    self._file.write(body)
+                    self._size += len(body)
+                if not message.get("more_body", False):
+                    self.complete = True
+                self._changed.set()
+        finally:
+            self._changed.set()
+
+    async def iter_bytes(self, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        offset = 0
+        while True:
+            if offset < self._size:
+                self._file.seek(offset)
+                data = self._file.read(min(size, self._size - offset))
+                offset += len(data)
+                yield data
+                continue
+            if self.complete:
+                return
+            if self.disconnected.is_set():
+                raise ClientDisconnect()
+            self._changed.clear()
+            await self._changed.wait()
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        self._file.close()
+
+
+async def iter_body_chunks(spool: RequestBodySpool, chunker: StreamingChunker) -> AsyncIterator[str]:
+    """Decode the spooled body as UTF-8 as it arrives and yield chunks as they are sealed.
+
+    Raises UnicodeDecodeError on invalid UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for data in spool.iter_bytes():
+        for chunk in chunker.feed(decoder.decode(data)):
+            yield chunk
+    for chunk in chunker.feed(decoder.decode(b"", final=True)) + chunker.finish():
+        yield chunk
+
+
+class IngestStreamingResponse(StreamingResponse):
+    """A StreamingResponse produced while `spool` is still receiving the request body.
+
+    Starlette's own disconnect listener calls `receive` alongside the response,
+    which would swallow body messages; here the spool owns `receive` and the
+    stream is cancelled when it reports a disconnect.
+    """
+
+    def __init__(self, content, spool: RequestBodySpool, **kwargs):
+        super().__init__(content, **kwargs)
+        self.spool = spool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stream = asyncio.ensure_future(self.stream_response(send))
+
+        async def watch_disconnect() -> None:
+            await self.spool.disconnected.wait()
+            stream.cancel()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await stream
+        except asyncio.CancelledError:
+            if not watcher.done():
+                raise
+        finally:
+            watcher.cancel()
+            stream.cancel()
+            self.spool.close()
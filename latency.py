@@ -0,0 +1,71 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from mp3_index import Mp3FrameIndexer
+
+
+class LatencyWindow:
+    """Recent latency samples (seconds) with percentile summaries."""
+
+    def __init__(self, max_samples: int = 256):
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None when empty."""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        rank = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            last = self._samples[-1] if self._samples else None
+        return {
+            "count": self.count,
+            "last_ms": _ms(last),
+            "p50_ms": _ms(self.percentile(50)),
+            "p95_ms": _ms(self.percentile(95)),
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000.0, 1)
+
+
+class PlaybackLead:
+    """Tracks a stream's time to first byte and how far its audio runs ahead of playback.
+
+    Playback is assumed to start with the first audio byte and run in real
+    time; `indexer` must see every audio byte sent. `started` (a
+    `time.perf_counter()` value) defaults to now.
+    """
+
+    def __init__(self, ttfb: Optional[LatencyWindow] = None, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self.first_byte_at: Optional[float] = None
+        self.indexer = Mp3FrameIndexer()
+        self._ttfb = ttfb
+
+    def audio_sent(self) -> None:
+        if self.first_byte_at is None:
+            self.first_byte_at = time.perf_counter()
+            if self._ttfb is not None:
+                self._ttfb.add(self.first_byte_at - self.started)
+
+    def seconds(self) -> float:
+        """Buffered audio ahead of playback (0 before the first byte)."""
+        if self.first_byte_at is None:
+            return 0.0
+        return max(0.0, self.indexer.seconds - (time.perf_counter() - self.first_byte_at))
@@ -1,15 +1,58 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse, JSONResponse, Response
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.background import BackgroundTask
+import asyncio
 import tempfile
 import os
-import re
-import wave
 import sys
+import json
+import re
+import time
 import edge_tts
-from typing import List, AsyncIterator
+from audio_cache import AudioChunkCache, cache_key
+from audio_store import AudioStore, StoredAudio
+from captions import (
+    FRAME_AUDIO,
+    boundary_to_word,
+    encode_frame,
+    encode_word_frame,
+    first_word_at,
+    timed_word,
+    to_srt,
+    to_vtt,
+)
+from ingest import IngestStreamingResponse, RequestBodySpool, iter_body_chunks
+from latency import LatencyWindow, PlaybackLead
+from metrics import REGISTRY, MetricsMiddleware, record_stage, request_elapsed, timed
+from mp3_index import Mp3FrameIndexer, Mp3Index
+from render_jobs import JobManager, RenderJob
+from scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, SchedulerBusy, UpstreamScheduler
+from voice_catalog import VoiceCatalog
+from text_analysis import (
+    StreamingChunker,
+    TextAnalysis,
+    TextAnalysisCache,
+    adaptive_chunks,
+    adaptive_segments,
+    locate_slides,
+    prepare_text_for_chunk,
+)
+from tts_backends import HedgedBackend, make_backend
+from wav_engine import (
+    PcmDecoder,
+    decoder_available,
+    ends_sentence,
+    pause_points,
+    pause_times,
+    pcm_seconds,
+    splice_pauses,
+    wav_header,
+    word_positions,
+)
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List
 from pathlib import Path
 
 
@@ -24,7 +67,16 @@ def resolve_static_dir() -> Path:
 STATIC_DIR = resolve_static_dir()
 DIST_DIR = Path(__file__).resolve().parent / "dist"
 
-app = FastAPI(title="Talk Practice — edge-tts")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = asyncio.ensure_future(warm_up()) if TTS_WARMUP else None
+    yield
+    if warmup is not None:
+        warmup.cancel()
+    await TTS_BACKEND.close()
+
+
+app = FastAPI(title="Talk Practice — edge-tts", lifespan=lifespan)
 # Development-friendly CORS (restrict in production)
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +85,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# per-route latency, status, bytes and throughput at /metrics; SERVER_TIMING=1 adds a Server-Timing header
+app.add_middleware(MetricsMiddleware, server_timing=os.getenv("SERVER_TIMING", "0") == "1")
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 if DIST_DIR.exists():
     app.mount("/dist", StaticFiles(directory=str(DIST_DIR)), name="dist")
@@ -63,18 +117,117 @@ async def app_page_html():
     return FileResponse(str(STATIC_DIR / "app.html"))
 
 
-# Small curated voice list for the UI
-VOICES = [
-    {"name": "Ava (en-US)", "value": "en-US-AvaMultilingualNeural"},
-    {"name": "Jenny (en-US)", "value": "en-US-JennyNeural"},
-    {"name": "Libby (en-GB)", "value": "en-GB-LibbyNeural"},
-    {"name": "Natasha (en-AU)", "value": "en-AU-NatashaNeural"},
-]
-
-
 @app.get("/voices")
-async def list_voices():
-    return JSONResponse(content=VOICES)
+async def list_voices(request: Request, locale: str | None = None, gender: str | None = None, style: str | None = None):
+    """The edge voice catalog, optionally filtered.
+
+    - `locale` is a locale (`en-GB`) or a language (`en`); `gender` is
+      Female | Male; `style` is a voice tag such as `News` or `Friendly`.
+    - Responses carry an ETag; a matching `If-None-Match` gets 304.
+    """
+    await VOICE_CATALOG.ensure_loaded()
+    VOICE_CATALOG.refresh_if_stale()
+    etag = VOICE_CATALOG.etag_for(locale, gender, style)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=VOICE_CATALOG.find(locale=locale, gender=gender, style=style), headers=headers)
+
+
+@app.get("/health")
+async def health():
+    """Liveness plus warmup progress; `app` identifies this server to the desktop launcher."""
+    return JSONResponse(content={"app": "PracticeTalk", "status": "ok", "warmup": WARMUP_STATE})
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    await VOICE_CATALOG.ensure_loaded()
+    return JSONResponse(
+        content={
+            **AUDIO_CACHE.stats(),
+            "words": WORD_CACHE.stats(),
+            "analysis": ANALYSIS_CACHE.stats(),
+            "voices": VOICE_CATALOG.stats(),
+        }
+    )
+
+
+@app.get("/backend/stats")
+async def backend_stats():
+    return JSONResponse(
+        content={
+            **TTS_BACKEND.stats(),
+            "scheduler": UPSTREAM_SCHEDULER.stats(),
+            "stream_ttfb": {policy: window.summary() for policy, window in STREAM_TTFB.items()},
+        }
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, stage, cache, scheduler and upstream metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+def collect_state_metrics():
+    """Scrape-time values from the caches, scheduler and upstream backend."""
+    caches = {"audio": AUDIO_CACHE.stats(), "words": WORD_CACHE.stats()}
+    tiers = ("memory", "disk")
+    yield (
+        "practicetalk_cache_hits_total",
+        "counter",
+        "Chunk cache hits by cache and tier.",
+        [({"cache": name, "tier": tier}, stats[f"{tier}_hits"]) for name, stats in caches.items() for tier in tiers],
+    )
+    yield (
+        "practicetalk_cache_misses_total",
+        "counter",
+        "Chunk cache misses.",
+        [({"cache": name}, stats["misses"]) for name, stats in caches.items()],
+    )
+    yield (
+        "practicetalk_cache_bytes",
+        "gauge",
+        "Bytes held by each chunk cache tier.",
+        [({"cache": name, "tier": tier}, stats[f"{tier}_bytes"]) for name, stats in caches.items() for tier in tiers],
+    )
+    analysis = ANALYSIS_CACHE.stats()
+    yield (
+        "practicetalk_analysis_cache_requests_total",
+        "counter",
+        "Script analysis cache lookups by result.",
+        [({"result": "hit"}, analysis["hits"]), ({"result": "miss"}, analysis["misses"])],
+    )
+    scheduler = UPSTREAM_SCHEDULER.stats()
+    yield ("practicetalk_upstream_active", "gauge", "Upstream sessions in progress.", [({}, scheduler["active"])])
+    yield (
+        "practicetalk_upstream_queued",
+        "gauge",
+        "Chunks waiting for an upstream slot.",
+        [({"priority": priority}, n) for priority, n in scheduler["queued"].items()],
+    )
+    yield (
+        "practicetalk_upstream_admissions_total",
+        "counter",
+        "Scheduler decisions (granted at once, waited, rejected with 429).",
+        [({"result": result}, scheduler[result]) for result in ("granted", "waited", "rejected")],
+    )
+    backend = TTS_BACKEND.stats()
+    events = {**backend, **backend.get("hedging", {})}
+    yield (
+        "practicetalk_upstream_events_total",
+        "counter",
+        "Upstream backend counters (turns, connects, reuses, hedges, retries, resumes, ...).",
+        [
+            ({"event": event}, value)
+            for event, value in events.items()
+            if isinstance(value, int) and not event.endswith("_connections")
+        ],
+    )
+
+
+REGISTRY.collector(collect_state_metrics)
 
 
 @app.post("/estimate")
@@ -85,34 +238,23 @@ async def estimate(file: UploadFile | None = File(None), text: str | None = Form
     Response JSON includes: estimated_seconds, speech_seconds, pause_seconds,
     slide_pause_seconds, words, chars, sentences, slide_pauses, chunk_count.
     """
-    if file is None and (text is None or not text.strip()):
-        raise HTTPException(status_code=400, detail="No text provided")
-
-    if file is not None:
-        content = await file.read()
-        try:
-            text_to_est = content.decode("utf-8")
-        except Exception:
-            raise HTTPException(status_code=400, detail="Uploaded file must be UTF-8 text")
-    else:
-        text_to_est = (text or "").strip()
-
+    text_to_est = (await read_text_input(file, text)).strip()
     if not text_to_est:
         raise HTTPException(status_code=400, detail="Text is empty")
 
-    # preprocess slides
-    preprocessed = preprocess_slides(text_to_est)
+    # one tokenizer pass (memoized, so the synthesis request that follows reuses it)
+    analysis = analyze_text(text_to_est)
 
-    words = len(re.findall(r"\w+", preprocessed))
-    chars = len(preprocessed)
-    sentences = len(SENTENCE_END_RE.findall(preprocessed))
-    slide_pauses = preprocessed.count("__SLIDE_PAUSE__")
+    words = analysis.words
+    chars = analysis.chars
+    sentences = analysis.sentences
+    slide_pauses = analysis.slide_pauses
 
     # resolve pace -> pause multiplier
     prosody_rate, pause_multiplier = resolve_pace(pace or "normal")
     base_pause = DEFAULT_PAUSE_MS
     pause_seconds = (base_pause * pause_multiplier * sentences) / 1000.0
-    slide_pause_seconds = slide_pauses * 3.0
+    slide_pause_seconds = slide_pauses * SLIDE_PAUSE_SECONDS
 
     # approximate speaking time using words-per-minute per pace
     WPM = {"slow": 120, "normal": 160, "fast": 200, "faster": 240}
@@ -120,7 +262,7 @@ async def estimate(file: UploadFile | None = File(None), text: str | None = Form
     speech_seconds = (words / max(1, wpm)) * 60.0
 
     estimated_seconds = speech_seconds + pause_seconds + slide_pause_seconds + 0.25
-    chunk_count = len(split_text(preprocessed, max_chars=4000))
+    chunk_count = len(analysis.chunks)
 
     return JSONResponse(content={
         "estimated_seconds": round(estimated_seconds, 2),
@@ -135,9 +277,6 @@ async def estimate(file: UploadFile | None = File(None), text: str | None = Form
     })
 
 
-SENTENCE_END_RE = re.compile(r"(?<=[\.\?!])\s+")
-
-
 # Pace configuration -> (SSML prosody rate, pause multiplier)
 PACE_MAP = {
     "slow": ("-15%", 1.2),
@@ -149,204 +288,1081 @@ PACE_MAP = {
 # default base pause (ms) inserted after sentence punctuation
 DEFAULT_PAUSE_MS = 300
 
-# match groups of Slide markers (e.g. "Slide 1 Slide 2 Slide 3")
-SLIDE_RE = re.compile(r"(?:Slide\s*\d+\s*){1,}", flags=re.IGNORECASE)
-
-
-def split_text(text: str, max_chars: int = 4000) -> List[str]:
-    """Split text into chunks (prefer sentence boundaries)."""
-    text = text.strip()
-    if len(text) <= max_chars:
-        return [text]
-
-    parts: List[str] = []
-    start = 0
-    L = len(text)
-    while start < L:
-        end = min(start + max_chars, L)
-        segment = text[start:end]
-        matches = list(SENTENCE_END_RE.finditer(segment))
-        if matches:
-            split_at = matches[-1].end()
-            parts.append(segment[:split_at].strip())
-            start += split_at
-        else:
-            # fallback: hard split
-            parts.append(segment.strip())
-            start += len(segment)
+# silence per slide pause (charged by /estimate, emitted in WAV output)
+SLIDE_PAUSE_SECONDS = 3.0
+
+# number of chunks synthesized concurrently (output order is always preserved)
+SYNTH_CONCURRENCY = max(1, int(os.getenv("SYNTH_CONCURRENCY", 4)))
+
+# edge-tts output format (fixed by the service for Communicate.stream)
+OUTPUT_FORMAT = "audio-24khz-48kbitrate-mono-mp3"
 
-        # skip whitespace between chunks
-        while start < L and text[start].isspace():
-            start += 1
+# synthesized chunk cache: hot in-memory LRU tier + on-disk tier
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "practicetalk-cache"))
+AUDIO_CACHE = AudioChunkCache(
+    memory_bytes=int(float(os.getenv("AUDIO_CACHE_MEMORY_MB", 64)) * 1024 * 1024),
+    disk_bytes=int(float(os.getenv("AUDIO_CACHE_DISK_MB", 512)) * 1024 * 1024),
+    disk_dir=AUDIO_CACHE_DIR,
+)
+
+# word timings per cached chunk, next to the audio (same key, JSON [[offset, duration, text], ...])
+WORD_CACHE = AudioChunkCache(
+    memory_bytes=int(float(os.getenv("WORD_CACHE_MEMORY_MB", 8)) * 1024 * 1024),
+    disk_bytes=int(float(os.getenv("WORD_CACHE_DISK_MB", 64)) * 1024 * 1024),
+    disk_dir=AUDIO_CACHE_DIR,
+    suffix=".words.json",
+)
 
-    return parts
+# upstream synthesis backend: edge (one edge-tts session per chunk), edge-pool
+# (pooled edge websockets, opt-in), or local
+TTS_BACKEND = make_backend(
+    os.getenv("TTS_BACKEND", "edge"),
+    local_url=os.getenv("TTS_LOCAL_URL", "ws://127.0.0.1:8765/tts"),
+    max_idle=int(os.getenv("TTS_POOL_MAX_IDLE", 8)),
+    idle_timeout=float(os.getenv("TTS_POOL_IDLE_SECONDS", 60)),
+)
 
+# admission control: global cap on concurrent upstream sessions, fair per-client queueing
+UPSTREAM_SCHEDULER = UpstreamScheduler(
+    max_concurrent=int(os.getenv("UPSTREAM_MAX_CONCURRENT", 8)),
+    max_queued=int(os.getenv("UPSTREAM_MAX_QUEUED", 200)),
+)
 
-def preprocess_slides(text: str) -> str:
-    """Replace consecutive slide markers with a slide-pause token."""
-    return SLIDE_RE.sub("__SLIDE_PAUSE__", text)
+# tail-latency protection: hedge slow first responses, resume broken streams at the last word boundary
+if os.getenv("TTS_HEDGE", "1") != "0":
+    TTS_BACKEND = HedgedBackend(
+        TTS_BACKEND,
+        percentile=float(os.getenv("TTS_HEDGE_PERCENTILE", 95)),
+        min_deadline=float(os.getenv("TTS_HEDGE_MIN_MS", 300)) / 1000.0,
+        initial_deadline=float(os.getenv("TTS_HEDGE_INITIAL_MS", 2500)) / 1000.0,
+        max_retries=int(os.getenv("TTS_MAX_RETRIES", 2)),
+        stall_timeout=float(os.getenv("TTS_STALL_SECONDS", 10)),
+        max_hold=float(os.getenv("TTS_RESUME_HOLD_MS", 250)) / 1000.0,
+        # hedges take a slot too, and are skipped when none is free
+        scheduler=UPSTREAM_SCHEDULER,
+    )
+
+# slice size used when streaming cached chunk audio
+CACHE_STREAM_BYTES = 64 * 1024
+
+# streaming chunk policy: "adaptive" starts with about one sentence and grows
+# the chunks as buffered audio runs ahead of playback; "fixed" uses 4000-char chunks
+STREAM_CHUNKING = os.getenv("STREAM_CHUNKING", "adaptive")
+STREAM_FIRST_CHARS = int(os.getenv("STREAM_FIRST_CHARS", 160))
+STREAM_CHUNK_GROWTH = float(os.getenv("STREAM_CHUNK_GROWTH", 2.0))
+
+# measured time to first audio byte of the streaming endpoints, per chunk policy
+STREAM_TTFB = {policy: LatencyWindow() for policy in ("adaptive", "fixed", "incremental")}
+
+# longest script accepted by the form endpoints (they hold the whole text);
+# /synthesize_stream_body streams the script instead and has no limit
+MAX_TEXT_CHARS = int(os.getenv("MAX_TEXT_CHARS", 200_000))
+
+# memoized script analysis shared by /estimate and the synthesis endpoints
+ANALYSIS_CACHE = TextAnalysisCache(max_entries=int(os.getenv("ANALYSIS_CACHE_ENTRIES", 32)))
+
+# full edge voice list: disk cache next to the audio cache, refreshed in the background
+# once older than the TTL, with the bundled snapshot as the offline fallback
+VOICE_CATALOG = VoiceCatalog(
+    cache_path=os.getenv("VOICE_CATALOG_PATH", os.path.join(AUDIO_CACHE_DIR, "voices.json")),
+    snapshot_path=str(STATIC_DIR / "voices_snapshot.json"),
+    ttl_seconds=float(os.getenv("VOICE_CATALOG_TTL_HOURS", 24)) * 3600,
+    fetch=edge_tts.list_voices,
+)
+
+# desktop fast-start: after startup, load the voice catalog and open one upstream
+# connection in the background so the first synthesis does not pay for them
+TTS_WARMUP = os.getenv("TTS_WARMUP", "0") == "1"
+WARMUP_STATE = {"done": False, "seconds": None, "error": None}
+
+
+async def warm_up() -> None:
+    started = time.perf_counter()
+    try:
+        await VOICE_CATALOG.ensure_loaded()
+        VOICE_CATALOG.refresh_if_stale()
+        await TTS_BACKEND.warm()
+    except Exception as exc:  # warmup is best effort; the first request retries for real
+        WARMUP_STATE["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        seconds = time.perf_counter() - started
+        record_stage("warmup", seconds)
+        WARMUP_STATE.update(done=True, seconds=round(seconds, 3))
 
 
-def prepare_text_for_chunk(chunk: str) -> str:
-    """Prepare plain text chunk for edge-tts (avoid raw SSML tags being spoken)."""
-    return chunk.replace("__SLIDE_PAUSE__", " ")
+CHUNKS_TOTAL = REGISTRY.counter(
+    "practicetalk_chunks_total", "Chunks served, from the audio cache or synthesized upstream.", labels=("source",)
+)
+UPSTREAM_AUDIO_BYTES = REGISTRY.counter("practicetalk_upstream_audio_bytes_total", "MP3 bytes received from upstream.")
 
 
 def resolve_pace(pace: str):
     return PACE_MAP.get((pace or "").lower(), PACE_MAP["normal"])
 
 
-async def iter_mp3_audio_bytes(text_chunk: str, voice: str, prosody_rate: str) -> AsyncIterator[bytes]:
-    """Yield MP3 bytes directly from edge-tts streaming events."""
-    communicator = edge_tts.Communicate(text_chunk, voice=voice, rate=prosody_rate)
-    async for event in communicator.stream():
-        if event.get("type") == "audio":
-            data = event.get("data")
-            if data:
-                yield data
+async def read_text_input(file: UploadFile | None, text: str | None) -> str:
+    """Return the uploaded file (decoded as UTF-8) or the pasted text."""
+    if file is None and (text is None or not text.strip()):
+        raise HTTPException(status_code=400, detail="No text provided")
+
+    try:
+        if file is not None:
+            content = await file.read()
+            try:
+                return content.decode("utf-8")
+            except Exception:
+                raise HTTPException(status_code=400, detail="Uploaded file must be UTF-8 text")
+        return text or ""
+    finally:
+        # receiving and parsing the form happens before the endpoint runs, so time from request start
+        elapsed = request_elapsed()
+        if elapsed is not None:
+            record_stage("upload_read", elapsed)
+
+
+def analyze_text(text: str, max_chars: int = 4000) -> TextAnalysis:
+    """Memoized script analysis (slide preprocessing, tokenizing, chunking), timed as `analyze`."""
+    with timed("analyze"):
+        return ANALYSIS_CACHE.analyze(text, max_chars=max_chars)
+
+
+async def iter_chunk_events(
+    text_chunk: str,
+    voice: str,
+    prosody_rate: str,
+    client_id: str = "",
+    priority: int = PRIORITY_BULK,
+    words: bool = False,
+) -> AsyncIterator[tuple]:
+    """Yield `("audio", bytes)` events for one chunk, from the audio cache when possible.
+
+    With `words`, `("word", [offset, duration, text])` events (ticks from the
+    chunk start) are yielded too; a cached chunk then also needs cached words.
+    Misses wait for an upstream slot from `UPSTREAM_SCHEDULER`, stream from
+    the TTS backend and cache both audio and word timings once the chunk
+    completes, so captions never need a second synthesis pass.
+    """
+    key = cache_key(text_chunk, voice, prosody_rate, OUTPUT_FORMAT)
+    cached = await asyncio.to_thread(AUDIO_CACHE.get, key)
+    cached_words = None
+    if cached is not None and words:
+        cached_words = await asyncio.to_thread(WORD_CACHE.get, key)
+    if cached is not None and (not words or cached_words is not None):
+        CHUNKS_TOTAL.inc(source="cache")
+        for word in json.loads(cached_words) if words else []:
+            yield "word", word
+        for start in range(0, len(cached), CACHE_STREAM_BYTES):
+            yield "audio", cached[start:start + CACHE_STREAM_BYTES]
+        return
+
+    CHUNKS_TOTAL.inc(source="upstream")
+    parts: List[bytes] = []
+    found: List[list] = []
+    queued = time.perf_counter()
+    async with UPSTREAM_SCHEDULER.slot(client_id, priority):
+        started = time.perf_counter()
+        record_stage("queue_wait", started - queued)
+        async for event in TTS_BACKEND.stream(text_chunk, voice=voice, rate=prosody_rate, boundary="WordBoundary"):
+            if event.get("type") == "audio":
+                data = event.get("data")
+                if data:
+                    if not parts:
+                        record_stage("chunk_first_audio", time.perf_counter() - started)
+                    parts.append(data)
+                    yield "audio", data
+            elif event.get("type") == "WordBoundary":
+                word = boundary_to_word(event)
+                found.append(word)
+                if words:
+                    yield "word", word
+        record_stage("chunk_synthesis", time.perf_counter() - started)
+    UPSTREAM_AUDIO_BYTES.inc(sum(len(part) for part in parts))
+    await asyncio.to_thread(AUDIO_CACHE.put, key, b"".join(parts))
+    await asyncio.to_thread(WORD_CACHE.put, key, json.dumps(found).encode("utf-8"))
+
+
+def stream_chunks(analysis: TextAnalysis, chunking: str, incremental: bool, started: float) -> tuple:
+    """Pick the streaming chunk source; returns (chunks, PlaybackLead).
+
+    Incremental requests keep their stable segments (so they stay cacheable);
+    with `chunking=adaptive` the first segment is split for a fast start.
+    """
+    if chunking not in ("adaptive", "fixed"):
+        raise HTTPException(status_code=400, detail="chunking must be 'adaptive' or 'fixed'")
+    policy = "incremental" if incremental else chunking
+    lead = PlaybackLead(STREAM_TTFB[policy], started=started)
+    if incremental and chunking == "fixed":
+        return analysis.segments, lead
+    if incremental:
+        segments = adaptive_segments(
+            analysis.segments, first_chars=STREAM_FIRST_CHARS, growth=STREAM_CHUNK_GROWTH, max_chars=analysis.max_chars
+        )
+        return segments, lead
+    if chunking == "fixed":
+        return analysis.chunks, lead
+    chunks = adaptive_chunks(
+        analysis.text.strip(),
+        analysis.gaps,
+        lead_seconds=lead.seconds,
+        first_chars=STREAM_FIRST_CHARS,
+        growth=STREAM_CHUNK_GROWTH,
+        max_chars=analysis.max_chars,
+    )
+    return chunks, lead
+
+
+def count_cached_chunks(chunks: List[str], voice: str, prosody_rate: str) -> int:
+    """Number of chunks whose audio is already in the audio cache."""
+    return sum(
+        1
+        for chunk in chunks
+        if AUDIO_CACHE.contains(cache_key(prepare_text_for_chunk(chunk).strip(), voice, prosody_rate, OUTPUT_FORMAT))
+    )
+
+
+def segment_headers(chunks: List[str], voice: str, prosody_rate: str) -> dict:
+    """Response headers describing how much of an incremental render is reused."""
+    return {
+        "X-Segments-Total": str(len(chunks)),
+        "X-Segments-Reused": str(count_cached_chunks(chunks, voice, prosody_rate)),
+    }
+
+
+_CHUNK_DONE = object()
+
+
+async def _fill_chunk_buffer(
+    text_chunk: str,
+    voice: str,
+    prosody_rate: str,
+    buffer: asyncio.Queue,
+    client_id: str,
+    priority: int,
+    words: bool,
+) -> None:
+    """Synthesize one chunk into `buffer`, ending with `_CHUNK_DONE` or the raised error."""
+    try:
+        async for event in iter_chunk_events(
+            text_chunk, voice=voice, prosody_rate=prosody_rate, client_id=client_id, priority=priority, words=words
+        ):
+            buffer.put_nowait(event)
+    except Exception as exc:
+        buffer.put_nowait(exc)
+        return
+    buffer.put_nowait(_CHUNK_DONE)
+
+
+async def _read_chunk_source(chunks: AsyncIterable[str], ready: asyncio.Queue) -> None:
+    """Move chunks from an async source into `ready`, ending with `_CHUNK_DONE` or the raised error."""
+    try:
+        async for chunk in chunks:
+            await ready.put(chunk)
+    except Exception as exc:
+        await ready.put(exc)
+        return
+    await ready.put(_CHUNK_DONE)
+
+
+async def iter_chunks_events(
+    chunks: Iterable[str] | AsyncIterable[str],
+    voice: str,
+    prosody_rate: str,
+    concurrency: int = SYNTH_CONCURRENCY,
+    on_chunk_done: Callable[[], None] | None = None,
+    client_id: str = "",
+    priority: int = PRIORITY_BULK,
+    words: bool = False,
+) -> AsyncIterator[tuple]:
+    """Yield `iter_chunk_events` events for all chunks in order, synthesizing up to `concurrency` at once.
+
+    The head chunk is streamed as it arrives; later chunks fill per-chunk buffers
+    in the background. At most `concurrency` chunks are in flight or buffered.
+    `on_chunk_done` is called each time a chunk has been fully yielded.
+    `client_id` and `priority` are passed to the upstream scheduler.
+
+    `chunks` is pulled lazily, so an adaptive source sizes each chunk when it
+    is scheduled. An async source (such as a request body still uploading) is
+    read one chunk ahead in the background, so a slow source never holds back
+    audio that is already synthesized.
+    """
+    reader = None
+    if isinstance(chunks, AsyncIterable):
+        ready: asyncio.Queue = asyncio.Queue(maxsize=1)
+        reader = asyncio.create_task(_read_chunk_source(chunks, ready))
+    else:
+        texts = iter(chunks)
+    in_flight: deque = deque()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < max(1, concurrency):
+                if reader is None:
+                    chunk = next(texts, _CHUNK_DONE)
+                elif ready.empty() and in_flight:
+                    break
+                else:
+                    chunk = await ready.get()
+                if chunk is _CHUNK_DONE:
+                    exhausted = True
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                text_chunk = prepare_text_for_chunk(chunk).strip()
+                if not text_chunk:
+                    continue
+                buffer: asyncio.Queue = asyncio.Queue()
+                task = asyncio.create_task(
+                    _fill_chunk_buffer(text_chunk, voice, prosody_rate, buffer, client_id, priority, words)
+                )
+                in_flight.append((task, buffer))
+            if not in_flight:
+                break
+
+            _, buffer = in_flight[0]
+            while True:
+                item = await buffer.get()
+                if item is _CHUNK_DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            in_flight.popleft()
+            if on_chunk_done is not None:
+                on_chunk_done()
+    finally:
+        for task, _ in in_flight:
+            task.cancel()
+        if reader is not None:
+            reader.cancel()
+
+
+async def iter_chunks_audio_bytes(
+    chunks: Iterable[str] | AsyncIterable[str],
+    voice: str,
+    prosody_rate: str,
+    concurrency: int = SYNTH_CONCURRENCY,
+    on_chunk_done: Callable[[], None] | None = None,
+    client_id: str = "",
+    priority: int = PRIORITY_BULK,
+) -> AsyncIterator[bytes]:
+    """Yield MP3 bytes for all chunks in order (see `iter_chunks_events`)."""
+    async for _, data in iter_chunks_events(
+        chunks, voice, prosody_rate, concurrency, on_chunk_done=on_chunk_done, client_id=client_id, priority=priority
+    ):
+        yield data
+
+
+async def iter_timed_events(
+    chunks: Iterable[str],
+    voice: str,
+    prosody_rate: str,
+    indexer: Mp3FrameIndexer,
+    on_chunk_done: Callable[[], None] | None = None,
+    client_id: str = "",
+    priority: int = PRIORITY_BULK,
+) -> AsyncIterator[tuple]:
+    """Yield `("audio", bytes)` and `("word", {"text", "start", "end"})` for the whole output.
+
+    Word times are in seconds from the start of the output: each chunk's
+    upstream offsets are shifted by the exact duration of the audio before it,
+    measured by `indexer` (which sees every audio byte and chunk boundary).
+    """
+    base = 0.0
+
+    def chunk_done() -> None:
+        nonlocal base
+        indexer.mark_chunk_boundary()
+        base = indexer.seconds
+        if on_chunk_done is not None:
+            on_chunk_done()
+
+    async for kind, payload in iter_chunks_events(
+        chunks,
+        voice,
+        prosody_rate,
+        on_chunk_done=chunk_done,
+        client_id=client_id,
+        priority=priority,
+        words=True,
+    ):
+        if kind == "audio":
+            indexer.feed(payload)
+            yield kind, payload
+        else:
+            yield kind, timed_word(payload, base)
+
+
+# rendered audio spool (served with Content-Length, ETag and byte ranges)
+AUDIO_STORE = AudioStore(
+    ttl_seconds=float(os.getenv("AUDIO_STORE_TTL_SECONDS", 3600)),
+    max_bytes=int(float(os.getenv("AUDIO_STORE_MAX_MB", 1024)) * 1024 * 1024),
+    spool_dir=os.getenv("AUDIO_STORE_DIR") or None,
+)
+
+
+# entity tags in an If-None-Match list: "*" or (W/)"opaque"
+ETAG_LIST_RE = re.compile(r'\*|(?:W/)?"[^"]*"')
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of `etag` against an If-None-Match header (RFC 9110 13.1.2)."""
+    opaque = etag.removeprefix("W/")
+    return any(tag == "*" or tag.removeprefix("W/") == opaque for tag in ETAG_LIST_RE.findall(if_none_match))
+
+
+def client_key(request: Request) -> str:
+    """Identify the caller for fair scheduling (first X-Forwarded-For hop behind a proxy)."""
+    forwarded = request.headers.get("x-forwarded-for", "")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else ""
+
+
+def admit_synthesis() -> None:
+    """Reject with 429 + Retry-After when the upstream wait queue is full."""
+    try:
+        UPSTREAM_SCHEDULER.check_admission()
+    except SchedulerBusy as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": str(exc.retry_after)})
+
+
+def check_format(fmt: str | None) -> None:
+    """Reject unknown output formats, and WAV when no MP3 decoder is installed."""
+    if fmt not in ("mp3", "wav"):
+        raise HTTPException(status_code=400, detail="Unsupported format")
+    if fmt == "wav" and not decoder_available():
+        raise HTTPException(status_code=501, detail="WAV output needs the miniaudio package (pip install miniaudio)")
+
+
+def check_text_length(text: str) -> None:
+    """Reject scripts over MAX_TEXT_CHARS before any analysis or synthesis work."""
+    if len(text) > MAX_TEXT_CHARS:
+        raise HTTPException(status_code=413, detail=f"Text too long (max {MAX_TEXT_CHARS} characters)")
+
+
+async def check_voice(voice: str | None) -> None:
+    """Reject unknown voices locally instead of after an upstream round trip."""
+    await VOICE_CATALOG.ensure_loaded()
+    VOICE_CATALOG.refresh_if_stale()
+    if not VOICE_CATALOG.is_valid(voice):
+        raise HTTPException(status_code=400, detail=f"Unknown voice: {voice}")
+
+
+def audio_file_response(
+    request: Request | None,
+    path: str,
+    media_type: str,
+    filename: str,
+    etag: str,
+    download: bool = True,
+    headers: dict | None = None,
+) -> Response:
+    """Serve an immutable audio file with ETag, Content-Length and Range support."""
+    if request is not None and etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="attachment" if download else "inline",
+        headers={"ETag": etag, "Cache-Control": "private, max-age=3600", **(headers or {})},
+    )
+
+
+async def render_mp3(
+    write: Callable[[bytes], None],
+    chunks: List[str],
+    voice: str,
+    prosody_rate: str,
+    slide_numbers: List[int],
+    on_chunk_done: Callable[[], None] | None = None,
+    client_id: str = "",
+    priority: int = PRIORITY_BULK,
+) -> Mp3Index:
+    """Render `chunks` through `write` and return the frame and word index of the written MP3.
+
+    A slide inside a chunk starts at the first word at or after its marker;
+    without word timings for that chunk its start is interpolated from the
+    share of text before the marker (`exact: false`).
+    """
+    indexer = Mp3FrameIndexer()
+    words = []
+    # words of each speakable chunk, in the order they are synthesized
+    chunk_words: List[List[dict]] = [[]]
+
+    def chunk_done() -> None:
+        chunk_words.append([])
+        if on_chunk_done is not None:
+            on_chunk_done()
+
+    async for kind, payload in iter_timed_events(
+        chunks, voice, prosody_rate, indexer, on_chunk_done=chunk_done, client_id=client_id, priority=priority
+    ):
+        if kind == "audio":
+            write(payload)
+        else:
+            words.append(payload)
+            chunk_words[-1].append(payload)
+
+    index = indexer.finish()
+    index.words = words
+    spoken = [text for text in (prepare_text_for_chunk(chunk).strip() for chunk in chunks) if text]
+    for slide in locate_slides(chunks, slide_numbers):
+        word = None
+        if slide["fraction"] and slide["chunk"] < len(spoken):
+            word = first_word_at(spoken[slide["chunk"]], slide["offset"], chunk_words[slide["chunk"]])
+        if word is not None:
+            start = word["start"]
+        else:
+            start = index.chunk_start(slide["chunk"], slide["fraction"])
+        index.slides.append(
+            {
+                "number": slide["number"],
+                "start_seconds": round(start, 3),
+                "byte_offset": index.byte_offset_at(start),
+                # chunk boundaries and word timings are exact; otherwise estimated from the text share
+                "exact": slide["fraction"] == 0.0 or word is not None,
+            }
+        )
+    return index
+
+
+async def iter_wav_pcm(
+    chunks: Iterable[str],
+    voice: str,
+    prosody_rate: str,
+    pause_multiplier: float,
+    client_id: str = "",
+    priority: int = PRIORITY_BULK,
+) -> AsyncIterator[memoryview]:
+    """Yield 16-bit PCM for all chunks, with real silence for sentence and slide pauses.
+
+    Each chunk's MP3 (cached or streamed, see `iter_chunks_events`) is decoded
+    once it completes. Pauses inside a chunk are placed between the words
+    around them using the upstream word timings; a sentence gap between two
+    chunks, and the pauses of chunks with nothing to speak, go before the next
+    spoken chunk.
+    """
+    sentence_pause = DEFAULT_PAUSE_MS * pause_multiplier / 1000.0
+    plans: deque = deque()
+    done: List[tuple] = []
+    words: List[list] = []
+    decoder = PcmDecoder()
+
+    def planned() -> Iterator[str]:
+        carry = 0.0
+        for chunk in chunks:
+            spoken, points = pause_points(chunk, sentence_pause, SLIDE_PAUSE_SECONDS)
+            if not spoken:
+                carry += sum(seconds for _, seconds in points)
+                continue
+            plans.append((spoken, carry, points))
+            carry = sentence_pause if ends_sentence(chunk) else 0.0
+            yield chunk
+
+    def chunk_done() -> None:
+        done.append((plans.popleft(), list(words), decoder.take()))
+        words.clear()
+
+    async def flush() -> AsyncIterator[memoryview]:
+        for (spoken, before, points), chunk_words, mp3 in done:
+            pcm = await asyncio.to_thread(decoder.decode, mp3)
+            pauses = pause_times(points, word_positions(spoken, chunk_words), pcm_seconds(pcm))
+            for piece in splice_pauses(pcm, [(0.0, before)] + pauses if before else pauses):
+                yield piece
+        done.clear()
+
+    async for kind, payload in iter_chunks_events(
+        planned(), voice, prosody_rate, on_chunk_done=chunk_done, client_id=client_id, priority=priority, words=True
+    ):
+        async for piece in flush():
+            yield piece
+        if kind == "audio":
+            decoder.feed(payload)
+        else:
+            words.append(payload)
+    async for piece in flush():
+        yield piece
+
+
+def find_slide(index: Mp3Index | None, number: int) -> dict:
+    for slide in index.slides if index is not None else []:
+        if slide["number"] == number:
+            return slide
+    raise HTTPException(status_code=404, detail=f"Slide {number} not found")
+
+
+CAPTION_FORMATS = {"vtt": ("text/vtt", to_vtt), "srt": ("application/x-subrip", to_srt)}
+
+
+def captions_response(index: Mp3Index | None, fmt: str) -> Response:
+    """WebVTT or SRT captions built from the render's word timings."""
+    if fmt not in CAPTION_FORMATS:
+        raise HTTPException(status_code=404, detail="Captions are available as .vtt or .srt")
+    if index is None:
+        raise HTTPException(status_code=404, detail="No captions for this audio")
+    media_type, render = CAPTION_FORMATS[fmt]
+    return Response(
+        content=render(index.words),
+        media_type=media_type,
+        headers={"Content-Disposition": f'inline; filename="speech.{fmt}"'},
+    )
+
+
+def index_headers(index: Mp3Index | None, index_url: str) -> dict:
+    if index is None:
+        return {}
+    return {"X-Audio-Duration": f"{index.duration_seconds:.3f}", "X-Audio-Index": index_url}
+
+
+async def iter_file_from(path: str, offset: int) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            data = await asyncio.to_thread(f.read, CACHE_STREAM_BYTES)
+            if not data:
+                return
+            yield data
+
+
+def slide_response(path: str, media_type: str, slide: dict, size: int) -> StreamingResponse:
+    """Serve the file from the first frame of a slide (a valid standalone MP3)."""
+    offset = slide["byte_offset"]
+    return StreamingResponse(
+        iter_file_from(path, offset),
+        media_type=media_type,
+        headers={"Content-Length": str(size - offset), "X-Slide-Start": str(slide["start_seconds"])},
+    )
+
+
+def stored_audio_result(entry: StoredAudio, as_link: bool, headers: dict | None = None) -> Response:
+    headers = {**(headers or {}), "X-Audio-Url": entry.url, **index_headers(entry.index, f"{entry.url}/index")}
+    if as_link:
+        return JSONResponse(
+            status_code=201,
+            content={
+                "url": entry.url,
+                "download_url": f"{entry.url}?download=true",
+                "bytes": entry.size,
+                "media_type": entry.media_type,
+                "etag": entry.etag,
+                "duration_seconds": None if entry.index is None else round(entry.index.duration_seconds, 3),
+                "index_url": None if entry.index is None else f"{entry.url}/index",
+            },
+            headers={**headers, "Location": entry.url},
+        )
+    return audio_file_response(None, entry.path, entry.media_type, entry.filename, entry.etag, headers=headers)
+
+
+@app.get("/audio/{audio_id}")
+async def get_audio(audio_id: str, request: Request, download: bool = False):
+    """Serve previously rendered audio; supports Range and If-None-Match."""
+    entry = get_audio_or_404(audio_id)
+    return audio_file_response(request, entry.path, entry.media_type, entry.filename, entry.etag, download=download)
+
+
+def get_audio_or_404(audio_id: str) -> StoredAudio:
+    entry = AUDIO_STORE.get(audio_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Audio not found or expired")
+    return entry
+
+
+@app.get("/audio/{audio_id}/index")
+async def get_audio_index(audio_id: str):
+    """Duration, chunk and slide start times, and a seek table (time -> byte offset)."""
+    entry = get_audio_or_404(audio_id)
+    if entry.index is None:
+        raise HTTPException(status_code=404, detail="No index for this audio")
+    return JSONResponse(content=entry.index.to_dict(), headers={"Cache-Control": "private, max-age=3600"})
+
+
+@app.get("/audio/{audio_id}/captions.{fmt}")
+async def get_audio_captions(audio_id: str, fmt: str):
+    return captions_response(get_audio_or_404(audio_id).index, fmt)
+
+
+@app.get("/audio/{audio_id}/slides/{number}")
+async def get_audio_slide(audio_id: str, number: int):
+    """Audio from the start of slide `number` to the end."""
+    entry = get_audio_or_404(audio_id)
+    return slide_response(entry.path, entry.media_type, find_slide(entry.index, number), entry.size)
+
 
 @app.post("/synthesize")
 async def synthesize(
+    request: Request,
     file: UploadFile | None = File(None),
     text: str | None = Form(None),
     voice: str | None = Form("en-US-AvaMultilingualNeural"),
     fmt: str | None = Form("mp3"),
     pace: str | None = Form("normal"),
+    incremental: bool = Form(False),
+    as_link: bool = Form(False),
 ):
     """Synthesize text (file upload or pasted text).
 
     - `pace` controls speaking rate (slow | normal | fast | faster).
     - `Slide N` sequences are skipped during synthesis.
+    - `incremental` splits into stable slide/sentence segments so a re-render
+      after an edit only synthesizes the segments that changed.
+    - `as_link` returns JSON with the `/audio/{id}` URL of the rendered file
+      instead of the file itself (lets `<audio>` seek with range requests).
+    - `fmt=wav` decodes to PCM and inserts real silence: the pace-scaled
+      sentence pause and 3 s per slide marker, as `/estimate` assumes.
     """
-    if file is None and (text is None or not text.strip()):
-        raise HTTPException(status_code=400, detail="No text provided")
-
-    if file is not None:
-        content = await file.read()
-        try:
-            text_to_speak = content.decode("utf-8")
-        except Exception:
-            raise HTTPException(status_code=400, detail="Uploaded file must be UTF-8 text")
-    else:
-        text_to_speak = text or ""
-
-    text_to_speak = text_to_speak.strip()
+    text_to_speak = (await read_text_input(file, text)).strip()
     if not text_to_speak:
         raise HTTPException(status_code=400, detail="Text is empty")
+    check_text_length(text_to_speak)
 
-    if fmt not in ("mp3", "wav"):
-        raise HTTPException(status_code=400, detail="Unsupported format")
+    check_format(fmt)
+    await check_voice(voice)
 
     # validate inputs
-    prosody_rate, _ = resolve_pace(pace or "normal")
-
-    # preprocess slides (replace Slide markers with a token)
-    text_to_speak = preprocess_slides(text_to_speak)
-
-    MAX_CHARS = 200_000
-    if len(text_to_speak) > MAX_CHARS:
-        raise HTTPException(status_code=413, detail=f"Text too long (max {MAX_CHARS} characters)")
+    prosody_rate, pause_multiplier = resolve_pace(pace or "normal")
 
+    # preprocess slides (replace Slide markers with a token) and chunk
     # chunk size tuned for reliable synthesis
     CHUNK_SIZE = 4000
-    chunks = split_text(text_to_speak, max_chars=CHUNK_SIZE)
+    analysis = analyze_text(text_to_speak, max_chars=CHUNK_SIZE)
 
-    # --- MP3 path: synthesize per-chunk and append bytes ---
-    if fmt == "mp3":
-        audio_bytes = bytearray()
-        for chunk in chunks:
-            text_chunk = prepare_text_for_chunk(chunk).strip()
-            if not text_chunk:
-                continue
-            async for data in iter_mp3_audio_bytes(text_chunk, voice=voice, prosody_rate=prosody_rate):
-                audio_bytes.extend(data)
+    chunks = analysis.segments if incremental else analysis.chunks
 
-        return Response(
-            content=bytes(audio_bytes),
-            media_type="audio/mpeg",
-            headers={"Content-Disposition": 'attachment; filename="speech.mp3"'},
-        )
+    admit_synthesis()
+    client_id = client_key(request)
 
-    # --- WAV path: merge WAV frames properly using wave module ---
-    fd, out_path = tempfile.mkstemp(suffix=".wav")
-    os.close(fd)
-    out_wav = None
+    # --- MP3 path: synthesize per-chunk and spool bytes to disk ---
+    if fmt == "mp3":
+        headers = {}
+        if incremental:
+            headers.update(segment_headers(chunks, voice, prosody_rate))
+        entry = AUDIO_STORE.create("audio/mpeg", "speech.mp3")
+        try:
+            entry.index = await render_mp3(
+                entry.write, chunks, voice, prosody_rate, analysis.slide_numbers, client_id=client_id
+            )
+        except BaseException:
+            AUDIO_STORE.discard(entry)
+            raise
+        AUDIO_STORE.commit(entry)
+        return stored_audio_result(entry, as_link, headers)
+
+    # --- WAV path: decoded PCM with real pauses, header patched once the size is known ---
+    entry = AUDIO_STORE.create("audio/wav", "speech.wav")
     try:
-        out_wav = wave.open(out_path, "wb")
-        for i, chunk in enumerate(chunks):
-            tmpfd, tmp_path = tempfile.mkstemp(suffix=".wav")
-            os.close(tmpfd)
-            try:
-                text_chunk = prepare_text_for_chunk(chunk)
-                communicator = edge_tts.Communicate(text_chunk, voice=voice, rate=prosody_rate)
-                await communicator.save(tmp_path)
-                with wave.open(tmp_path, "rb") as src:
-                    if i == 0:
-                        out_wav.setnchannels(src.getnchannels())
-                        out_wav.setsampwidth(src.getsampwidth())
-                        out_wav.setframerate(src.getframerate())
-                    frames = src.readframes(src.getnframes())
-                    out_wav.writeframes(frames)
-            finally:
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
-        out_wav.close()
-        out_wav = None
-        return FileResponse(out_path, media_type="audio/wav", filename="speech.wav", background=BackgroundTask(lambda: os.remove(out_path)))
-    finally:
-        if out_wav is not None:
-            out_wav.close()
+        header = wav_header(0)
+        entry.write(header)
+        async for pcm in iter_wav_pcm(chunks, voice, prosody_rate, pause_multiplier, client_id=client_id):
+            entry.write(pcm)
+        entry.file.seek(0)
+        entry.file.write(wav_header(entry.size - len(header)))
+    except BaseException:
+        AUDIO_STORE.discard(entry)
+        raise
+    AUDIO_STORE.commit(entry)
+    return stored_audio_result(entry, as_link)
 
 
 @app.post("/synthesize_stream")
 async def synthesize_stream(
+    request: Request,
     file: UploadFile | None = File(None),
     text: str | None = Form(None),
     voice: str | None = Form("en-US-AvaMultilingualNeural"),
     pace: str | None = Form("normal"),
+    incremental: bool = Form(False),
+    chunking: str = Form(STREAM_CHUNKING),
+    fmt: str | None = Form("mp3"),
 ):
     """Stream MP3 bytes as chunks are synthesized.
 
     This endpoint streams `audio/mpeg` and is intended for clients that can
     progressively consume MP3 (the web UI uses MediaSource when streaming).
+    `incremental` works as in `/synthesize`.
+    `chunking=adaptive` (default) makes the first chunk about one sentence for
+    a fast start and grows later chunks; `chunking=fixed` uses 4000-char chunks.
+    `fmt=wav` streams 24 kHz mono PCM WAV (open-ended header) with real
+    sentence and slide pauses, one decoded chunk at a time.
     """
-    if file is None and (text is None or not text.strip()):
-        raise HTTPException(status_code=400, detail="No text provided")
+    started = time.perf_counter()
+    text_to_speak = (await read_text_input(file, text)).strip()
+    if not text_to_speak:
+        raise HTTPException(status_code=400, detail="Text is empty")
+    check_text_length(text_to_speak)
 
-    if file is not None:
-        content = await file.read()
-        try:
-            text_to_speak = content.decode("utf-8")
-        except Exception:
-            raise HTTPException(status_code=400, detail="Uploaded file must be UTF-8 text")
-    else:
-        text_to_speak = text or ""
+    check_format(fmt)
+    await check_voice(voice)
+
+    # apply slide preprocessing and pace
+    prosody_rate, pause_multiplier = resolve_pace(pace or "normal")
+    analysis = analyze_text(text_to_speak, max_chars=4000)
+
+    chunks, lead = stream_chunks(analysis, chunking, incremental, started)
+    headers = {}
+    if incremental:
+        headers = segment_headers(chunks, voice, prosody_rate)
+
+    admit_synthesis()
+    client_id = client_key(request)
+
+    if fmt == "wav":
+
+        async def wav_generator():
+            yield wav_header()
+            async for pcm in iter_wav_pcm(
+                chunks, voice, prosody_rate, pause_multiplier, client_id=client_id, priority=PRIORITY_INTERACTIVE
+            ):
+                lead.audio_sent()
+                yield pcm
+
+        return StreamingResponse(wav_generator(), media_type="audio/wav", headers=headers)
+
+    async def generator():
+        async for data in iter_chunks_audio_bytes(
+            chunks, voice=voice, prosody_rate=prosody_rate, client_id=client_id, priority=PRIORITY_INTERACTIVE
+        ):
+            lead.indexer.feed(data)
+            lead.audio_sent()
+            yield data
+
+    return StreamingResponse(generator(), media_type="audio/mpeg", headers=headers)
+
+
+@app.post("/synthesize_timed")
+async def synthesize_timed(
+    request: Request,
+    file: UploadFile | None = File(None),
+    text: str | None = Form(None),
+    voice: str | None = Form("en-US-AvaMultilingualNeural"),
+    pace: str | None = Form("normal"),
+    incremental: bool = Form(False),
+    chunking: str = Form(STREAM_CHUNKING),
+):
+    """Stream MP3 audio interleaved with word timings from the same upstream session.
 
-    text_to_speak = text_to_speak.strip()
+    The body is a sequence of frames: a 1-byte kind (1 = MP3 audio, 2 = UTF-8
+    JSON word `{"text", "start", "end"}` in seconds from the start of the
+    output), a 4-byte big-endian payload length, then the payload.
+    `incremental` and `chunking` work as in `/synthesize_stream`.
+    """
+    started = time.perf_counter()
+    text_to_speak = (await read_text_input(file, text)).strip()
     if not text_to_speak:
         raise HTTPException(status_code=400, detail="Text is empty")
+    check_text_length(text_to_speak)
 
-    # apply slide preprocessing and pace
+    await check_voice(voice)
     prosody_rate, _ = resolve_pace(pace or "normal")
-    text_to_speak = preprocess_slides(text_to_speak)
+    analysis = analyze_text(text_to_speak, max_chars=4000)
 
-    MAX_CHARS = 200_000
-    if len(text_to_speak) > MAX_CHARS:
-        raise HTTPException(status_code=413, detail=f"Text too long (max {MAX_CHARS} characters)")
+    chunks, lead = stream_chunks(analysis, chunking, incremental, started)
+    headers = {"X-Stream-Format": "practicetalk-timed-v1"}
+    if incremental:
+        headers.update(segment_headers(chunks, voice, prosody_rate))
 
-    chunks = split_text(text_to_speak, max_chars=4000)
+    admit_synthesis()
+    client_id = client_key(request)
 
     async def generator():
-        for chunk in chunks:
-            text_chunk = prepare_text_for_chunk(chunk).strip()
-            if not text_chunk:
-                continue
-            async for data in iter_mp3_audio_bytes(text_chunk, voice=voice, prosody_rate=prosody_rate):
-                yield data
+        async for kind, payload in iter_timed_events(
+            chunks, voice, prosody_rate, lead.indexer, client_id=client_id, priority=PRIORITY_INTERACTIVE
+        ):
+            if kind == "audio":
+                lead.audio_sent()
+            yield encode_frame(FRAME_AUDIO, payload) if kind == "audio" else encode_word_frame(payload)
+
+    return StreamingResponse(generator(), media_type="application/octet-stream", headers=headers)
+
+
+@app.post("/synthesize_stream_body")
+async def synthesize_stream_body(
+    request: Request,
+    voice: str = "en-US-AvaMultilingualNeural",
+    pace: str = "normal",
+    chunking: str = STREAM_CHUNKING,
+):
+    """Stream MP3 while the script itself is still uploading.
+
+    The script is the raw UTF-8 request body (e.g. `curl -T script.txt`);
+    options are query parameters. Chunks go to synthesis as soon as they are
+    sealed. The body is spooled to a temporary file as it arrives and read
+    back only as fast as synthesis needs it, so memory is bounded by the chunk
+    size and there is no length limit. Invalid UTF-8 after the first chunk
+    aborts the stream.
+    """
+    started = time.perf_counter()
+    if chunking not in ("adaptive", "fixed"):
+        raise HTTPException(status_code=400, detail="chunking must be 'adaptive' or 'fixed'")
+    await check_voice(voice)
+    prosody_rate, _ = resolve_pace(pace or "normal")
+    lead = PlaybackLead(STREAM_TTFB[chunking], started=started)
+    chunker = StreamingChunker(
+        max_chars=4000,
+        first_chars=STREAM_FIRST_CHARS if chunking == "adaptive" else None,
+        growth=STREAM_CHUNK_GROWTH,
+        lead_seconds=lead.seconds,
+    )
+    spool = RequestBodySpool(request.receive)
+    spool.start()
+    chunks = iter_body_chunks(spool, chunker)
+
+    # wait for the first speakable chunk so an empty or non-UTF-8 body still gets a 400
+    try:
+        async for first in chunks:
+            if prepare_text_for_chunk(first).strip():
+                break
+        else:
+            raise HTTPException(status_code=400, detail="Text is empty")
+        admit_synthesis()
+    except UnicodeDecodeError:
+        spool.close()
+        raise HTTPException(status_code=400, detail="Request body must be UTF-8 text")
+    except BaseException:
+        spool.close()
+        raise
+    client_id = client_key(request)
+
+    async def remaining_chunks():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    async def generator():
+        async for data in iter_chunks_audio_bytes(
+            remaining_chunks(),
+            voice=voice,
+            prosody_rate=prosody_rate,
+            client_id=client_id,
+            priority=PRIORITY_INTERACTIVE,
+        ):
+            lead.indexer.feed(data)
+            lead.audio_sent()
+            yield data
+
+    return IngestStreamingResponse(generator(), spool, media_type="audio/mpeg")
+
+
+def count_speakable_chunks(chunks: List[str]) -> int:
+    return sum(1 for chunk in chunks if prepare_text_for_chunk(chunk).strip())
+
+
+async def render_job(job: RenderJob) -> None:
+    """Render a queued job's MP3 into its spool file."""
+    with open(job.path, "wb") as out:
+
+        def write(data: bytes) -> None:
+            out.write(data)
+            job.bytes_written += len(data)
+
+        job.index = await render_mp3(
+            write,
+            job.chunks,
+            job.voice,
+            job.prosody_rate,
+            job.slide_numbers,
+            on_chunk_done=job.mark_chunk_done,
+            client_id=job.client_id,
+        )
+
+
+# background render jobs (results expire JOB_TTL_SECONDS after completion)
+JOBS = JobManager(
+    render_job,
+    workers=int(os.getenv("JOB_WORKERS", 2)),
+    ttl_seconds=float(os.getenv("JOB_TTL_SECONDS", 3600)),
+    max_queued=int(os.getenv("JOB_MAX_QUEUED", 100)),
+)
+
+
+def get_job_or_404(job_id: str) -> RenderJob:
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    request: Request,
+    file: UploadFile | None = File(None),
+    text: str | None = Form(None),
+    voice: str | None = Form("en-US-AvaMultilingualNeural"),
+    pace: str | None = Form("normal"),
+    incremental: bool = Form(False),
+):
+    """Queue an MP3 render and return its job id immediately.
+
+    Poll `GET /jobs/{id}` for progress and download from `GET /jobs/{id}/result`.
+    """
+    text_to_speak = (await read_text_input(file, text)).strip()
+    if not text_to_speak:
+        raise HTTPException(status_code=400, detail="Text is empty")
+    check_text_length(text_to_speak)
+
+    await check_voice(voice)
+    prosody_rate, _ = resolve_pace(pace or "normal")
+    analysis = analyze_text(text_to_speak, max_chars=4000)
+
+    chunks = analysis.segments if incremental else analysis.chunks
+
+    job = RenderJob(
+        chunks=chunks,
+        slide_numbers=analysis.slide_numbers,
+        voice=voice,
+        prosody_rate=prosody_rate,
+        chunks_total=count_speakable_chunks(chunks),
+        client_id=client_key(request),
+    )
+    try:
+        JOBS.submit(job)
+    except OverflowError as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": str(JOBS.retry_after())})
+    return JSONResponse(status_code=202, content=job.to_dict(), headers={"Location": f"/jobs/{job.id}"})
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    return JSONResponse(content=get_job_or_404(job_id).to_dict())
+
+
+def get_done_job_or_409(job_id: str) -> RenderJob:
+    job = get_job_or_404(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str, request: Request, download: bool = True):
+    job = get_done_job_or_409(job_id)
+    etag = f'"{job.id}-{job.bytes_written}"'
+    headers = index_headers(job.index, f"/jobs/{job.id}/index")
+    return audio_file_response(request, job.path, job.media_type, job.filename, etag, download=download, headers=headers)
+
+
+@app.get("/jobs/{job_id}/index")
+async def job_index(job_id: str):
+    job = get_done_job_or_409(job_id)
+    return JSONResponse(content=job.index.to_dict())
+
+
+@app.get("/jobs/{job_id}/captions.{fmt}")
+async def job_captions(job_id: str, fmt: str):
+    return captions_response(get_done_job_or_409(job_id).index, fmt)
+
+
+@app.get("/jobs/{job_id}/slides/{number}")
+async def job_slide(job_id: str, number: int):
+    job = get_done_job_or_409(job_id)
+    return slide_response(job.path, job.media_type, find_slide(job.index, number), job.bytes_written)
+
 
-    return StreamingResponse(generator(), media_type="audio/mpeg")
+@app.delete("/jobs/{job_id}", status_code=204)
+async def delete_job(job_id: str):
+    if not JOBS.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return Response(status_code=204)
 
 
 if __name__ == "__main__":
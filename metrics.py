@@ -0,0 +1,234 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# seconds: sub-millisecond stages up to multi-minute renders
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# bytes per second to a client
+RATE_BUCKETS = (1e3, 4e3, 16e3, 64e3, 256e3, 1e6, 4e6, 16e6, 64e6, 256e6)
+
+# (labels, value) pairs of one metric family
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def _value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(values.items()):
+            out.append(f"{self.name}{_labels(dict(zip(self.labels, key)))} {_value(value)}")
+        return out
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Iterable[float] = TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[i] += 1
+            total[0] += value
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(counts), total[0]) for key, (counts, total) in self._values.items()}
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(values.items()):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                out.append(f"{self.name}_bucket{_labels({**labels, 'le': _value(bound)})} {cumulative}")
+            out.append(f"{self.name}_sum{_labels(labels)} {_value(total)}")
+            out.append(f"{self.name}_count{_labels(labels)} {cumulative}")
+        return out
+
+
+class MetricsRegistry:
+    """Counters, histograms and scrape-time collectors in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List[object] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Samples]]]] = []
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Iterable[float] = TIME_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, collect: Callable[[], Iterable[Tuple[str, str, str, Samples]]]) -> None:
+        """Register `collect() -> [(name, type, help, samples)]`, called on every scrape."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines += metric.lines()
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_labels(labels)} {_value(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "practicetalk_stage_seconds",
+    "Time spent per pipeline stage (per request, or per chunk for chunk stages).",
+    labels=("stage",),
+)
+
+REQUESTS_TOTAL = REGISTRY.counter(
+    "practicetalk_requests_total", "HTTP requests by route and status.", labels=("route", "status")
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "practicetalk_request_seconds", "Time from request start to the last response byte.", labels=("route",)
+)
+RESPONSE_BYTES = REGISTRY.counter(
+    "practicetalk_response_bytes_total", "Response body bytes sent to clients.", labels=("route",)
+)
+RESPONSE_RATE = REGISTRY.histogram(
+    "practicetalk_response_bytes_per_second",
+    "Response body throughput from first to last byte (bodies of 64 KiB or more).",
+    labels=("route",),
+    buckets=RATE_BUCKETS,
+)
+
+# the request being handled: stage -> [seconds, count] (for Server-Timing) and its start time
+_REQUEST_TIMINGS: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+_REQUEST_STARTED: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_started", default=None)
+
+
+def request_elapsed() -> Optional[float]:
+    """Seconds since the current request started (None outside a request)."""
+    started = _REQUEST_STARTED.get()
+    return None if started is None else time.perf_counter() - started
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _REQUEST_TIMINGS.get()
+    if timings is not None:
+        entry = timings.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def server_timing(timings: Dict[str, List[float]]) -> str:
+    """Server-Timing header value; stages seen several times (per chunk) are summed."""
+    parts = []
+    for stage, (seconds, count) in timings.items():
+        desc = f';desc="sum of {count}"' if count > 1 else ""
+        parts.append(f"{stage};dur={seconds * 1000.0:.1f}{desc}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """Per-route request latency, status, bytes and client throughput; optional Server-Timing.
+
+    Routes are labelled by their template (`/audio/{audio_id}`), so ids do not
+    create new series. Throughput is measured from the first to the last body
+    byte. With `server_timing`, stages recorded before the response starts are
+    sent in a `Server-Timing` header.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, List[float]] = {}
+        token = _REQUEST_TIMINGS.set(timings)
+        started = time.perf_counter()
+        started_token = _REQUEST_STARTED.set(started)
+        state = {"status": 500, "bytes": 0, "first": None, "last": None}
+
+        async def send_with_metrics(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                if self.server_timing and timings:
+                    headers = list(message.get("headers", [])) + [(b"server-timing", server_timing(timings).encode("latin-1"))]
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if body:
+                    now = time.perf_counter()
+                    if state["first"] is None:
+                        state["first"] = now
+                    state["last"] = now
+                    state["bytes"] += len(body)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _REQUEST_TIMINGS.reset(token)
+            _REQUEST_STARTED.reset(started_token)
+            # the router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUESTS_TOTAL.inc(route=route, status=state["status"])
+            REQUEST_SECONDS.observe(time.perf_counter() - started, route=route)
+            RESPONSE_BYTES.inc(state["bytes"], route=route)
+            if state["bytes"] >= 64 * 1024 and state["last"] > state["first"]:
+                RESPONSE_RATE.observe(state["bytes"] / (state["last"] - state["first"]), route=route)
@@ -0,0 +1,185 @@
+"""Offline stand-in for the edge read-aloud websocket service.
+
+Speaks the same protocol as the real service (speech.config / ssml requests,
+turn.start / audio / audio.metadata / turn.end responses) and returns valid
+silent MP3 frames in the real output format, paced like speech. Point the app
+at it with `TTS_BACKEND=local TTS_LOCAL_URL=ws://127.0.0.1:8765/tts`.
+
+    python mock_tts_server.py --port 8765 --latency-ms 300 --jitter-ms 100
+
+Faults can be injected to exercise hedging and resume: `--stall-rate` turns
+wait `--stall-ms` before their first byte, `--drop-rate` turns close the
+connection partway through their audio.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import uuid
+from xml.sax.saxutils import unescape
+
+from aiohttp import WSMsgType, web
+
+
+# silent MPEG-2 Layer III frame: 24 kHz, 48 kbit/s, mono (= edge-tts output format)
+MP3_FRAME_HEADER = bytes([0xFF, 0xF3, 0x64, 0xC4])
+MP3_FRAME_BYTES = 144
+MP3_FRAME_SECONDS = 576 / 24000
+SILENT_MP3_FRAME = MP3_FRAME_HEADER + bytes(MP3_FRAME_BYTES - len(MP3_FRAME_HEADER))
+
+TICKS_PER_SECOND = 10_000_000
+WORD_RE = re.compile(r"\w+")
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+class MockTTSConfig:
+    def __init__(
+        self,
+        latency_ms: float = 200.0,
+        jitter_ms: float = 50.0,
+        realtime_factor: float = 20.0,
+        seconds_per_word: float = 0.4,
+        frames_per_message: int = 32,
+        stall_rate: float = 0.0,
+        stall_ms: float = 10_000.0,
+        drop_rate: float = 0.0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        # how many seconds of audio are produced per wall-clock second
+        self.realtime_factor = realtime_factor
+        self.seconds_per_word = seconds_per_word
+        self.frames_per_message = frames_per_message
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        self.drop_rate = drop_rate
+
+    def first_byte_delay(self) -> float:
+        return max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+
+
+class DroppedTurn(Exception):
+    """Injected fault: the turn's connection was closed mid-stream."""
+
+
+def text_message(request_id: str, path: str, body: str = "", content_type: str = "application/json; charset=utf-8") -> str:
+    return f"X-RequestId:{request_id}\r\nContent-Type:{content_type}\r\nPath:{path}\r\n\r\n{body}"
+
+
+def audio_message(request_id: str, data: bytes) -> bytes:
+    head = f"X-RequestId:{request_id}\r\nContent-Type:audio/mpeg\r\nPath:audio\r\n".encode("utf-8")
+    return len(head).to_bytes(2, "big") + head + data
+
+
+def word_boundary(word: str, offset_s: float, duration_s: float) -> dict:
+    return {
+        "Type": "WordBoundary",
+        "Data": {
+            "Offset": int(offset_s * TICKS_PER_SECOND),
+            "Duration": int(duration_s * TICKS_PER_SECOND),
+            "text": {"Text": word, "Length": len(word), "BoundaryType": "WordBoundary"},
+        },
+    }
+
+
+async def synthesize_turn(
+    ws: web.WebSocketResponse, config: MockTTSConfig, ssml: str, word_boundaries: bool, stats: dict
+) -> None:
+    request_id = uuid.uuid4().hex
+    words = WORD_RE.findall(unescape(TAG_RE.sub(" ", ssml)))
+    await ws.send_str(text_message(request_id, "turn.start", '{"context":{"serviceTag":"mock"}}'))
+    delay = config.first_byte_delay()
+    if random.random() < config.stall_rate:
+        stats["stalls"] += 1
+        delay += config.stall_ms / 1000.0
+    await asyncio.sleep(delay)
+
+    total_frames = max(1, int(len(words) * config.seconds_per_word / MP3_FRAME_SECONDS))
+    drop_at = total_frames + 1
+    if random.random() < config.drop_rate:
+        stats["drops"] += 1
+        drop_at = random.randint(1, total_frames)
+    batch = max(1, config.frames_per_message)
+    batch_delay = batch * MP3_FRAME_SECONDS / max(config.realtime_factor, 1e-6)
+    sent = 0
+    next_word = 0
+    while sent < total_frames:
+        if sent >= drop_at:
+            raise DroppedTurn()
+        n = min(batch, total_frames - sent)
+        await ws.send_bytes(audio_message(request_id, SILENT_MP3_FRAME * n))
+        sent += n
+        if word_boundaries:
+            audio_s = sent * MP3_FRAME_SECONDS
+            while next_word < len(words) and next_word * config.seconds_per_word < audio_s:
+                meta = word_boundary(words[next_word], next_word * config.seconds_per_word, config.seconds_per_word * 0.9)
+                await ws.send_str(text_message(request_id, "audio.metadata", json.dumps({"Metadata": [meta]})))
+                next_word += 1
+        await asyncio.sleep(batch_delay)
+    await ws.send_str(text_message(request_id, "turn.end", "{}"))
+
+
+async def handle_tts(request: web.Request) -> web.WebSocketResponse:
+    config: MockTTSConfig = request.app["config"]
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    request.app["stats"]["connections"] += 1
+    word_boundaries = False
+    async for message in ws:
+        if message.type != WSMsgType.TEXT:
+            continue
+        head, _, body = message.data.partition("\r\n\r\n")
+        if "Path:speech.config" in head:
+            options = json.loads(body)["context"]["synthesis"]["audio"]["metadataoptions"]
+            word_boundaries = options.get("wordBoundaryEnabled") == "true"
+        elif "Path:ssml" in head:
+            request.app["stats"]["turns"] += 1
+            try:
+                await synthesize_turn(ws, config, body, word_boundaries, request.app["stats"])
+            except DroppedTurn:
+                await ws.close()
+                break
+            except ConnectionResetError:
+                # the client gave up on the turn (e.g. a hedged duplicate lost)
+                break
+    return ws
+
+
+async def handle_stats(request: web.Request) -> web.Response:
+    return web.json_response(request.app["stats"])
+
+
+def create_app(config: MockTTSConfig | None = None) -> web.Application:
+    app = web.Application()
+    app["config"] = config or MockTTSConfig()
+    app["stats"] = {"connections": 0, "turns": 0, "stalls": 0, "drops": 0}
+    app.router.add_get("/tts", handle_tts)
+    app.router.add_get("/stats", handle_stats)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="mean time to first audio byte per turn")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="std deviation of the first-byte latency")
+    parser.add_argument("--realtime-factor", type=float, default=20.0, help="seconds of audio produced per second")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="share of turns that stall before the first byte")
+    parser.add_argument("--stall-ms", type=float, default=10_000.0, help="extra first-byte delay of a stalled turn")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="share of turns whose connection drops mid-audio")
+    args = parser.parse_args()
+    config = MockTTSConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        realtime_factor=args.realtime_factor,
+        stall_rate=args.stall_rate,
+        stall_ms=args.stall_ms,
+        drop_rate=args.drop_rate,
+    )
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
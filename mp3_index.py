@@ -0,0 +1,165 @@
+import bisect
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# bitrate tables (kbit/s) for Layer III, indexed by the header's bitrate index
+MPEG1_L3_BITRATES = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0)
+MPEG2_L3_BITRATES = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0)
+SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def parse_frame_header(header: bytes) -> Optional[Tuple[int, int, int]]:
+    """Return (frame_bytes, samples_per_frame, sample_rate) for a Layer III header, else None."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer = (header[1] >> 1) & 0x03  # 1 = Layer III
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    if version == 1 or layer != 1 or rate_index == 3:
+        return None
+    bitrates = MPEG1_L3_BITRATES if version == 3 else MPEG2_L3_BITRATES
+    bitrate = bitrates[bitrate_index] * 1000
+    if bitrate == 0:
+        return None
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    samples = 1152 if version == 3 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+@dataclass
+class Mp3Index:
+    """Frame-accurate index of a rendered MP3 file."""
+
+    frames: int
+    frame_seconds: float
+    bytes: int
+    frame_offsets: array
+    chunk_frames: List[int]
+    slides: List[Dict[str, object]] = field(default_factory=list)
+    words: List[Dict[str, object]] = field(default_factory=list)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frames * self.frame_seconds
+
+    def frame_at(self, seconds: float) -> int:
+        if self.frames == 0 or self.frame_seconds <= 0:
+            return 0
+        return min(self.frames - 1, max(0, int(seconds / self.frame_seconds)))
+
+    def byte_offset_at(self, seconds: float) -> int:
+        """Offset of the frame playing at `seconds` (a valid place to start decoding)."""
+        if self.frames == 0:
+            return 0
+        return self.frame_offsets[self.frame_at(seconds)]
+
+    def time_at_byte(self, offset: int) -> float:
+        frame = max(0, bisect.bisect_right(self.frame_offsets, offset) - 1)
+        return frame * self.frame_seconds
+
+    def chunk_start(self, chunk: int, fraction: float = 0.0) -> float:
+        """Start time of `chunk`, or a `fraction` of the way through it."""
+        if not self.chunk_frames:
+            return 0.0
+        chunk = min(chunk, len(self.chunk_frames) - 1)
+        start = self.chunk_frames[chunk]
+        end = self.chunk_frames[chunk + 1] if chunk + 1 < len(self.chunk_frames) else self.frames
+        return (start + fraction * (end - start)) * self.frame_seconds
+
+    def to_dict(self, seek_interval: float = 1.0) -> Dict[str, object]:
+        step = max(1, int(round(seek_interval / self.frame_seconds))) if self.frame_seconds else 1
+        return {
+            "duration_seconds": round(self.duration_seconds, 3),
+            "frames": self.frames,
+            "frame_seconds": self.frame_seconds,
+            "bytes": self.bytes,
+            "chunks": [
+                {"index": i, "start_seconds": round(f * self.frame_seconds, 3), "byte_offset": self._offset(f)}
+                for i, f in enumerate(self.chunk_frames)
+            ],
+            "slides": self.slides,
+            "seek_table": [
+                [round(f * self.frame_seconds, 3), self.frame_offsets[f]] for f in range(0, self.frames, step)
+            ],
+        }
+
+    def _offset(self, frame: int) -> int:
+        return self.frame_offsets[frame] if frame < self.frames else self.bytes
+
+
+class Mp3FrameIndexer:
+    """Incrementally indexes MP3 frames as bytes are written, without decoding.
+
+    Feed every written byte in order; call `mark_chunk_boundary` between
+    synthesized chunks. Bytes that are not part of a frame (tags, garbage)
+    are skipped by resynchronizing on the next frame header.
+    """
+
+    def __init__(self):
+        self._offset = 0
+        self._remaining = 0
+        self._header = bytearray()
+        self._header_offset = 0
+        self._frame_offsets = array("Q")
+        self._chunk_frames: List[int] = [0]
+        self.frame_seconds = 0.0
+
+    def feed(self, data: bytes) -> None:
+        pos = 0
+        n = len(data)
+        while pos < n:
+            if self._remaining:
+                step = min(self._remaining, n - pos)
+                self._remaining -= step
+                pos += step
+                continue
+            if not self._header:
+                self._header_offset = self._offset + pos
+            take = min(4 - len(self._header), n - pos)
+            self._header += data[pos:pos + take]
+            pos += take
+            if len(self._header) < 4:
+                break
+            parsed = parse_frame_header(bytes(self._header))
+            if parsed is None:
+                # resync one byte later
+                del self._header[0]
+                self._header_offset += 1
+                while self._header and self._header[0] != 0xFF:
+                    del self._header[0]
+                    self._header_offset += 1
+                continue
+            frame_bytes, samples, sample_rate = parsed
+            if not self.frame_seconds:
+                self.frame_seconds = samples / sample_rate
+            self._frame_offsets.append(self._header_offset)
+            self._remaining = frame_bytes - 4
+            self._header.clear()
+        self._offset += n
+
+    @property
+    def seconds(self) -> float:
+        """Duration of the frames indexed so far."""
+        return len(self._frame_offsets) * self.frame_seconds
+
+    def mark_chunk_boundary(self) -> None:
+        """Record that the next frame starts a new chunk."""
+        self._chunk_frames.append(len(self._frame_offsets))
+
+    def finish(self) -> Mp3Index:
+        frames = len(self._frame_offsets)
+        chunk_frames = self._chunk_frames
+        # the boundary after the last chunk is the end of the file, not a chunk
+        while len(chunk_frames) > 1 and chunk_frames[-1] >= frames:
+            chunk_frames = chunk_frames[:-1]
+        return Mp3Index(
+            frames=frames,
+            frame_seconds=self.frame_seconds,
+            bytes=self._offset,
+            frame_offsets=self._frame_offsets,
+            chunk_frames=chunk_frames,
+        )
@@ -0,0 +1,190 @@
+import asyncio
+import math
+import os
+import tempfile
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from mp3_index import Mp3Index
+
+
+@dataclass
+class RenderJob:
+    """A background synthesis request and its progress."""
+
+    chunks: List[str]
+    slide_numbers: List[int]
+    voice: str
+    prosody_rate: str
+    chunks_total: int
+    client_id: str = ""
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    media_type: str = "audio/mpeg"
+    filename: str = "speech.mp3"
+    status: str = "queued"  # queued | running | done | failed | cancelled
+    chunks_done: int = 0
+    bytes_written: int = 0
+    error: Optional[str] = None
+    path: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    index: Optional[Mp3Index] = None
+
+    def mark_chunk_done(self) -> None:
+        self.chunks_done += 1
+
+    def to_dict(self) -> dict:
+        now = time.time()
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at or now) - self.started_at
+        return {
+            "id": self.id,
+            "status": self.status,
+            "chunks_done": self.chunks_done,
+            "chunks_total": self.chunks_total,
+            "bytes": self.bytes_written,
+            "elapsed_seconds": round(elapsed, 2),
+            "queued_seconds": round((self.started_at or now) - self.created_at, 2),
+            "error": self.error,
+            "expires_in_seconds": None if self.expires_at is None else max(0, round(self.expires_at - now)),
+            "result_url": f"/jobs/{self.id}/result" if self.status == "done" else None,
+            "index_url": f"/jobs/{self.id}/index" if self.index is not None else None,
+            "duration_seconds": None if self.index is None else round(self.index.duration_seconds, 3),
+        }
+
+
+class JobManager:
+    """Queue of render jobs processed by a fixed pool of asyncio workers.
+
+    `render(job)` must write the job's audio to `job.path`. Finished jobs and
+    their files are dropped `ttl_seconds` after completion.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[RenderJob], Awaitable[None]],
+        workers: int = 2,
+        ttl_seconds: float = 3600,
+        max_queued: int = 100,
+        spool_dir: Optional[str] = None,
+    ):
+        self.render = render
+        self.workers = max(1, workers)
+        self.ttl_seconds = ttl_seconds
+        self.max_queued = max_queued
+        self.spool_dir = spool_dir
+        self.jobs: Dict[str, RenderJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._loop = None
+        self._durations: Deque[float] = deque(maxlen=20)
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        for job in self.jobs.values():
+            if job.status == "queued":
+                self._queue.put_nowait(job.id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def queued_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.status == "queued")
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up, from recent render times."""
+        if not self._durations:
+            return 30
+        mean = sum(self._durations) / len(self._durations)
+        return int(min(300, max(1, math.ceil(mean / self.workers))))
+
+    def submit(self, job: RenderJob) -> RenderJob:
+        """Queue `job`; raises OverflowError when the queue is full."""
+        self.purge_expired()
+        if self.queued_count() >= self.max_queued:
+            raise OverflowError("Too many queued jobs")
+        self._ensure_workers()
+        self.jobs[job.id] = job
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        self.purge_expired()
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued/running job or discard a finished one."""
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        if job.status in ("queued", "running"):
+            job.status = "cancelled"
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        self._remove_file(job)
+        return True
+
+    def purge_expired(self) -> None:
+        now = time.time()
+        for job_id, job in list(self.jobs.items()):
+            if job.expires_at is not None and job.expires_at <= now:
+                self.jobs.pop(job_id, None)
+                self._remove_file(job)
+
+    @staticmethod
+    def _remove_file(job: RenderJob) -> None:
+        if job.path:
+            try:
+                os.remove(job.path)
+            except OSError:
+                pass
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != "queued":
+                continue
+            task = asyncio.create_task(self._run(job))
+            self._running[job_id] = task
+            try:
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                self._running.pop(job_id, None)
+
+    async def _run(self, job: RenderJob) -> None:
+        suffix = os.path.splitext(job.filename)[1]
+        fd, job.path = tempfile.mkstemp(suffix=suffix, dir=self.spool_dir)
+        os.close(fd)
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            await self.render(job)
+            job.status = "done"
+            self._durations.append(time.time() - job.started_at)
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            self._remove_file(job)
+            raise
+        except Exception as exc:
+            job.status = "failed"
+            job.error = str(exc) or exc.__class__.__name__
+            self._remove_file(job)
+        finally:
+            job.finished_at = time.time()
+            job.expires_at = job.finished_at + self.ttl_seconds
+            job.chunks = []
@@ -0,0 +1,162 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BULK: "bulk"}
+
+
+class SchedulerBusy(Exception):
+    """Raised at admission when the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class UpstreamScheduler:
+    """Caps concurrent upstream sessions and shares them fairly.
+
+    Waiters are grouped by priority class and, within a class, by client;
+    clients are served round-robin so one large upload cannot starve others.
+    Interactive work is preferred, but bulk work gets at least one of every
+    `interactive_weight + 1` grants while both are waiting.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_queued: int = 200, interactive_weight: int = 3):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max_queued
+        self.interactive_weight = max(1, interactive_weight)
+        self._active = 0
+        self._waiting: Dict[int, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            PRIORITY_INTERACTIVE: OrderedDict(),
+            PRIORITY_BULK: OrderedDict(),
+        }
+        self._interactive_streak = 0
+        self._releases: Deque[float] = deque()
+        self.counters: Dict[str, int] = {"granted": 0, "waited": 0, "rejected": 0}
+
+    def queued(self, priority: int | None = None) -> int:
+        classes: List[int] = list(self._waiting) if priority is None else [priority]
+        return sum(len(q) for p in classes for q in self._waiting[p].values())
+
+    def drain_rate(self, window: float = 60.0) -> float:
+        """Observed slot releases per second over the last `window` seconds."""
+        now = time.monotonic()
+        while self._releases and now - self._releases[0] > window:
+            self._releases.popleft()
+        if len(self._releases) < 2:
+            return 0.0
+        span = max(now - self._releases[0], 1.0)
+        return len(self._releases) / span
+
+    def retry_after(self) -> int:
+        rate = self.drain_rate()
+        if rate <= 0:
+            return 5
+        return int(min(300, max(1, math.ceil((self.queued() + 1) / rate))))
+
+    def check_admission(self) -> None:
+        """Raise SchedulerBusy if the wait queue is already full."""
+        if self.queued() >= self.max_queued:
+            self.counters["rejected"] += 1
+            raise SchedulerBusy(self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self, client_id: str = "", priority: int = PRIORITY_BULK) -> AsyncIterator[None]:
+        """Hold one upstream session slot for the duration of the block."""
+        await self._acquire(client_id, priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free and nobody is waiting; never queues.
+
+        For optional extra sessions (hedges). Give the slot back with `release`.
+        """
+        if self._active < self.max_concurrent and self.queued() == 0:
+            self._active += 1
+            self.counters["granted"] += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Return a slot taken with `try_acquire`."""
+        self._release()
+
+    async def _acquire(self, client_id: str, priority: int) -> None:
+        if self.try_acquire():
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(client_id, deque()).append(future)
+        self.counters["waited"] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # granted while being cancelled: hand the slot on
+                self._release()
+            else:
+                self._forget(priority, client_id, future)
+            raise
+
+    def _forget(self, priority: int, client_id: str, future: asyncio.Future) -> None:
+        waiters = self._waiting[priority].get(client_id)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiting[priority][client_id]
+
+    def _next_class(self) -> int | None:
+        has_interactive = bool(self._waiting[PRIORITY_INTERACTIVE])
+        has_bulk = bool(self._waiting[PRIORITY_BULK])
+        if has_interactive and (not has_bulk or self._interactive_streak < self.interactive_weight):
+            self._interactive_streak += 1
+            return PRIORITY_INTERACTIVE
+        if has_bulk:
+            self._interactive_streak = 0
+            return PRIORITY_BULK
+        return None
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._releases.append(time.monotonic())
+        while self._active < self.max_concurrent:
+            priority = self._next_class()
+            if priority is None:
+                return
+            clients = self._waiting[priority]
+            client_id, waiters = next(iter(clients.items()))
+            future = waiters.popleft()
+            # round-robin: the served client moves to the back of its class
+            del clients[client_id]
+            if waiters:
+                clients[client_id] = waiters
+            if future.done():
+                continue
+            self._active += 1
+            self.counters["granted"] += 1
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            **self.counters,
+            "active": self._active,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "queued": {PRIORITY_NAMES[p]: self.queued(p) for p in self._waiting},
+            "queued_clients": {PRIORITY_NAMES[p]: len(c) for p, c in self._waiting.items()},
+            "drain_rate_per_second": round(self.drain_rate(), 3),
+        }
@@ -0,0 +1,60 @@
+from audio_cache import AudioChunkCache, cache_key
+
+
+def test_cache_key_ignores_whitespace_only_edits():
+    assert cache_key("Hello  world.\n", "v", "+0%", "mp3") == cache_key(" Hello world.", "v", "+0%", "mp3")
+    assert cache_key("Hello world.", "v", "+0%", "mp3") != cache_key("Hello world.", "v", "+20%", "mp3")
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = AudioChunkCache(memory_bytes=250, disk_bytes=0, disk_dir=str(tmp_path))
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    assert cache.get("a") == b"a" * 100  # "b" is now the oldest
+    cache.put("c", b"c" * 100)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["memory_evictions"] == 1
+    assert stats["memory_bytes"] == 200
+
+
+def test_disk_tier_serves_what_memory_evicted(tmp_path):
+    cache = AudioChunkCache(memory_bytes=150, disk_bytes=1000, disk_dir=str(tmp_path))
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)  # evicts "a" from memory only
+    assert cache.get("a") == b"a" * 100
+    stats = cache.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_evictions"] == 2  # "a" came back into memory and pushed "b" out
+    assert stats["disk_entries"] == 2
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path):
+    cache = AudioChunkCache(memory_bytes=0, disk_bytes=250, disk_dir=str(tmp_path))
+    for key in ("a", "b"):
+        cache.put(key, key.encode() * 100)
+    assert cache.get("a") is not None  # refreshes "a" on disk
+    cache.put("c", b"c" * 100)
+    assert cache.get("b") is None
+    assert not (tmp_path / "b.mp3").exists()
+    assert (tmp_path / "a.mp3").exists() and (tmp_path / "c.mp3").exists()
+    assert cache.stats()["disk_evictions"] == 1
+
+
+def test_disk_index_survives_a_restart_within_budget(tmp_path):
+    first = AudioChunkCache(memory_bytes=0, disk_bytes=1000, disk_dir=str(tmp_path))
+    for key in ("a", "b", "c"):
+        first.put(key, key.encode() * 100)
+    reopened = AudioChunkCache(memory_bytes=0, disk_bytes=250, disk_dir=str(tmp_path))
+    stats = reopened.stats()
+    assert stats["disk_entries"] == 2 and stats["disk_bytes"] == 200
+    assert sum(reopened.get(key) is not None for key in ("a", "b", "c")) == 2
+
+
+def test_oversized_entries_skip_a_tier(tmp_path):
+    cache = AudioChunkCache(memory_bytes=50, disk_bytes=1000, disk_dir=str(tmp_path))
+    cache.put("big", b"x" * 100)
+    stats = cache.stats()
+    assert stats["memory_entries"] == 0 and stats["disk_entries"] == 1
+    assert cache.get("big") == b"x" * 100
@@ -0,0 +1,33 @@
+import os
+import time
+
+from audio_store import AudioStore
+
+
+def stored(store: AudioStore, data: bytes, age: float = 0.0):
+    entry = store.create("audio/mpeg", "talk.mp3")
+    entry.created_at = time.time() - age
+    entry.write(data)
+    return store.commit(entry)
+
+
+def test_expired_entries_are_removed_behind_fresh_ones(tmp_path):
+    store = AudioStore(ttl_seconds=60, spool_dir=str(tmp_path))
+    # committed first but created last (e.g. a short render finishing before a long one)
+    fresh = stored(store, b"a" * 10)
+    stale = stored(store, b"b" * 10, age=120)
+    assert store.get(stale.id) is None
+    assert not os.path.exists(stale.path)
+    assert store.get(fresh.id) is fresh
+
+
+def test_oldest_entries_go_first_when_over_budget(tmp_path):
+    store = AudioStore(max_bytes=25, spool_dir=str(tmp_path))
+    first = stored(store, b"a" * 10)
+    second = stored(store, b"b" * 10)
+    third = stored(store, b"c" * 10)
+    assert store.get(first.id) is None
+    assert store.get(second.id) is second and store.get(third.id) is third
+    # a single entry over budget is kept rather than leaving nothing to serve
+    big = stored(store, b"d" * 100)
+    assert store.get(big.id) is big and store.get(third.id) is None
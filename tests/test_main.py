@@ -0,0 +1,27 @@
+from main import etag_matches
+
+
+def test_etag_matches_whole_tags_from_a_list():
+    assert etag_matches('"abc-10"', '"abc-10"')
+    assert etag_matches('"x", "abc-10" , "y"', '"abc-10"')
+    assert etag_matches('W/"abc-10"', '"abc-10"')
+    assert etag_matches("*", '"abc-10"')
+    # no substring matches
+    assert not etag_matches('"abc-100"', '"abc-10"')
+    assert not etag_matches('"xabc-10"', '"abc-10"')
+    assert not etag_matches("abc-10", '"abc-10"')
+    assert not etag_matches("", '"abc-10"')
+
+
+def test_oversized_scripts_are_rejected_before_analysis(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.setattr(main, "MAX_TEXT_CHARS", 100)
+    client = TestClient(main.app)
+    misses = main.ANALYSIS_CACHE.stats()["misses"]
+    for path in ("/synthesize", "/synthesize_stream", "/synthesize_timed", "/jobs"):
+        response = client.post(path, data={"text": "word " * 50, "voice": "no-such-voice"})
+        assert response.status_code == 413, path
+    assert main.ANALYSIS_CACHE.stats()["misses"] == misses
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from render_jobs import JobManager, RenderJob
+
+
+def make_job() -> RenderJob:
+    return RenderJob(chunks=["Hello."], slide_numbers=[], voice="v", prosody_rate="+0%", chunks_total=1)
+
+
+def test_full_queue_overflows_with_a_retry_estimate(tmp_path):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def render(job):
+            await release.wait()
+
+        jobs = JobManager(render, workers=1, max_queued=1, spool_dir=str(tmp_path))
+        assert jobs.retry_after() == 30  # nothing rendered yet
+        jobs.submit(make_job())
+        await asyncio.sleep(0.01)  # the worker takes the first job
+        jobs.submit(make_job())
+        with pytest.raises(OverflowError):
+            jobs.submit(make_job())
+        release.set()
+        await asyncio.sleep(0.05)
+        return jobs.retry_after(), [job.status for job in jobs.jobs.values()]
+
+    retry_after, statuses = asyncio.run(scenario())
+    assert statuses == ["done", "done"]
+    assert retry_after == 1
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, SchedulerBusy, UpstreamScheduler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrency_never_exceeds_the_cap():
+    async def scenario():
+        scheduler = UpstreamScheduler(max_concurrent=3)
+        active = peak = 0
+
+        async def work(client):
+            nonlocal active, peak
+            async with scheduler.slot(client):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(work(f"c{i % 4}") for i in range(20)))
+        return peak, scheduler.stats()
+
+    peak, stats = run(scenario())
+    assert peak == 3
+    assert stats["active"] == 0
+    assert stats["granted"] == 20
+
+
+def test_clients_are_served_round_robin():
+    async def scenario():
+        scheduler = UpstreamScheduler(max_concurrent=1)
+        order = []
+        gate = asyncio.Event()
+
+        async def work(client):
+            async with scheduler.slot(client):
+                order.append(client)
+                await gate.wait()
+
+        async with scheduler.slot("holder"):
+            tasks = [asyncio.create_task(work(c)) for c in ("a", "a", "a", "b", "c")]
+            await asyncio.sleep(0)
+            gate.set()
+        await asyncio.gather(*tasks)
+        return order
+
+    # "a" queued three requests first, but "b" and "c" are not stuck behind all of them
+    assert run(scenario()) == ["a", "b", "c", "a", "a"]
+
+
+def test_interactive_work_is_preferred_without_starving_bulk():
+    async def scenario():
+        scheduler = UpstreamScheduler(max_concurrent=1, interactive_weight=2)
+        order = []
+
+        async def work(client, priority):
+            async with scheduler.slot(client, priority):
+                order.append(priority)
+
+        async with scheduler.slot("holder"):
+            tasks = [asyncio.create_task(work(f"b{i}", PRIORITY_BULK)) for i in range(3)]
+            tasks += [asyncio.create_task(work(f"i{i}", PRIORITY_INTERACTIVE)) for i in range(4)]
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+
+    i, b = PRIORITY_INTERACTIVE, PRIORITY_BULK
+    assert run(scenario()) == [i, i, b, i, i, b, b]
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        scheduler = UpstreamScheduler(max_concurrent=1, max_queued=2)
+        async with scheduler.slot("holder"):
+            waiters = [asyncio.create_task(scheduler._acquire(f"c{i}", PRIORITY_BULK)) for i in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(SchedulerBusy) as busy:
+                scheduler.check_admission()
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+        return busy.value, scheduler.stats()
+
+    busy, stats = run(scenario())
+    assert 1 <= busy.retry_after <= 300
+    assert stats["rejected"] == 1
+    # cancelled waiters leave the queue and hold no slot
+    assert stats["queued"] == {"interactive": 0, "bulk": 0}
+    assert stats["active"] == 0
+
+
+def test_try_acquire_never_jumps_the_queue():
+    async def scenario():
+        scheduler = UpstreamScheduler(max_concurrent=2)
+        assert scheduler.try_acquire()
+        assert scheduler.try_acquire()
+        assert not scheduler.try_acquire()
+        scheduler.release()
+        waiter = asyncio.create_task(scheduler._acquire("c", PRIORITY_BULK))
+        await asyncio.sleep(0)
+        # the freed slot went to the waiter
+        assert waiter.done()
+        assert not scheduler.try_acquire()
+        scheduler.release()
+        scheduler.release()
+        return scheduler.stats()["active"]
+
+    assert run(scenario()) == 0
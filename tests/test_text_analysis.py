@@ -0,0 +1,171 @@
+import random
+import re
+from typing import List
+
+import pytest
+
+from text_analysis import (
+    SLIDE_PAUSE,
+    StreamingChunker,
+    TextAnalysisCache,
+    adaptive_chunks,
+    preprocess_slides,
+    sentence_gaps,
+    split_text,
+    tokenize,
+)
+
+# --- the original (pre-analysis) implementation, kept as the reference ---
+
+BASELINE_SENTENCE_END_RE = re.compile(r"(?<=[\.\?!])\s+")
+BASELINE_SLIDE_RE = re.compile(r"(?:Slide\s*\d+\s*){1,}", flags=re.IGNORECASE)
+
+
+def baseline_split_text(text: str, max_chars: int = 4000) -> List[str]:
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text]
+
+    parts: List[str] = []
+    start = 0
+    L = len(text)
+    while start < L:
+        end = min(start + max_chars, L)
+        segment = text[start:end]
+        matches = list(BASELINE_SENTENCE_END_RE.finditer(segment))
+        if matches:
+            split_at = matches[-1].end()
+            parts.append(segment[:split_at].strip())
+            start += split_at
+        else:
+            parts.append(segment.strip())
+            start += len(segment)
+        while start < L and text[start].isspace():
+            start += 1
+    return parts
+
+
+def baseline_estimate_counts(text: str) -> dict:
+    preprocessed = BASELINE_SLIDE_RE.sub("__SLIDE_PAUSE__", text)
+    return {
+        "text": preprocessed,
+        "words": len(re.findall(r"\w+", preprocessed)),
+        "sentences": len(BASELINE_SENTENCE_END_RE.findall(preprocessed)),
+        "slide_pauses": preprocessed.count("__SLIDE_PAUSE__"),
+    }
+
+
+# --- generated scripts ---
+
+WORDS = ["talk", "slide", "Slide", "data", "café", "x", "SLIDE", "3", "twelve", "mid-point", "so,", "İ"]
+
+
+def make_document(rng: random.Random) -> str:
+    """A script with sentences, slide markers, odd whitespace and long unpunctuated runs."""
+    parts = []
+    for _ in range(rng.randint(0, 120)):
+        roll = rng.random()
+        if roll < 0.08:
+            parts.append(f"Slide {rng.randint(1, 30)}" + rng.choice(["", " ", "\n", " Slide 4 "]))
+        elif roll < 0.1:
+            parts.append("x" * rng.randint(50, 300))
+        else:
+            sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 15)))
+            parts.append(sentence + rng.choice([".", "!", "?", "", ",", ". ", ".\n\n", "...  "]))
+    joiner = rng.choice([" ", "  ", "\n", "\t"])
+    return rng.choice(["", " ", "\n"]) + joiner.join(parts) + rng.choice(["", " ", "\n"])
+
+
+def documents(count: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng, make_document(rng), rng.choice([60, 200, 4000])
+
+
+def feed_in_pieces(chunker: StreamingChunker, text: str, rng: random.Random) -> List[str]:
+    sealed = []
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, 200)
+        sealed += chunker.feed(text[pos:pos + size])
+        pos += size
+    return sealed + chunker.finish()
+
+
+def test_tokenize_matches_baseline():
+    for _, text, max_chars in documents(1000, seed=8):
+        analysis = tokenize(text, max_chars=max_chars)
+        expected = baseline_estimate_counts(text)
+        assert analysis.text == expected["text"]
+        assert analysis.words == expected["words"]
+        assert analysis.sentences == expected["sentences"]
+        assert analysis.slide_pauses == expected["slide_pauses"]
+        assert analysis.chunks == baseline_split_text(expected["text"], max_chars=max_chars)
+
+
+def test_split_text_matches_baseline():
+    for _, text, max_chars in documents(500, seed=9):
+        preprocessed = preprocess_slides(text)
+        assert split_text(preprocessed, max_chars=max_chars) == baseline_split_text(preprocessed, max_chars=max_chars)
+
+
+def test_adaptive_chunks_keep_the_baseline_text():
+    for rng, text, max_chars in documents(500, seed=11):
+        body = preprocess_slides(text).strip()
+        first_chars = rng.choice([20, 80, 160])
+        chunks = list(adaptive_chunks(body, sentence_gaps(body), first_chars=first_chars, max_chars=max_chars))
+        assert "".join("".join(chunks).split()) == "".join("".join(baseline_split_text(body, max_chars)).split())
+        assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+        if len(chunks) > 1:
+            # a small first chunk: within budget unless its first sentence alone is longer
+            first_gap = next((end for start, end in sentence_gaps(body) if start > 0), len(body))
+            assert len(chunks[0]) <= max(first_chars, first_gap)
+
+
+def test_adaptive_chunks_grow_with_playback_lead():
+    body = " ".join(f"Sentence number {i} is here." for i in range(200))
+    flat = list(adaptive_chunks(body, sentence_gaps(body), first_chars=100, growth=1.0))
+    ahead = list(adaptive_chunks(body, sentence_gaps(body), lead_seconds=lambda: 60.0, first_chars=100, growth=1.0))
+    assert len(ahead[1]) > len(flat[1])
+
+
+@pytest.mark.parametrize("first_chars", [None, 20, 160])
+def test_streaming_chunker_matches_one_shot_chunking(first_chars):
+    for rng, text, max_chars in documents(1000, seed=12):
+        chunker = StreamingChunker(max_chars=max_chars, first_chars=first_chars, growth=2.0)
+        streamed = feed_in_pieces(chunker, text, rng)
+        preprocessed = preprocess_slides(text)
+        if first_chars is None:
+            # split_text returns [""] for blank text; the streaming chunker seals nothing
+            expected = [chunk for chunk in split_text(preprocessed, max_chars=max_chars) if chunk]
+        else:
+            body = preprocessed.strip()
+            expected = list(adaptive_chunks(body, sentence_gaps(body), first_chars=first_chars, max_chars=max_chars))
+        assert streamed == expected
+        assert chunker.chars == len(preprocessed)
+
+
+def test_streaming_chunker_never_splits_a_slide_marker():
+    text = "Intro sentence here. " + "Slide 12 " * 3 + "Body text follows."
+    for size in range(1, 12):
+        chunker = StreamingChunker(max_chars=30)
+        sealed = []
+        for pos in range(0, len(text), size):
+            sealed += chunker.feed(text[pos:pos + size])
+        sealed += chunker.finish()
+        assert "".join(sealed).count(SLIDE_PAUSE) == 1
+
+
+def test_analysis_cache_hits_and_evicts_least_recent():
+    cache = TextAnalysisCache(max_entries=2)
+    first = cache.analyze("One. Two.")
+    assert cache.analyze("One. Two.") is first
+    cache.analyze("Three.")
+    cache.analyze("One. Two.")  # refresh: "Three." is now the oldest
+    cache.analyze("Four.")
+    assert cache.analyze("One. Two.") is first
+    assert cache.stats() == {"hits": 3, "misses": 3, "entries": 2}
+    cache.analyze("Three.")
+    assert cache.stats()["misses"] == 4
+    # the chunk size is part of the key
+    assert cache.analyze("One. Two.", max_chars=5) is not first
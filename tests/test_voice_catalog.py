@@ -0,0 +1,62 @@
+import asyncio
+import json
+import threading
+
+from voice_catalog import VoiceCatalog
+
+SNAPSHOT = [{"ShortName": "en-US-AvaNeural", "Locale": "en-US", "Gender": "Female"}]
+FETCHED = SNAPSHOT + [{"ShortName": "de-DE-KatjaNeural", "Locale": "de-DE", "Gender": "Female"}]
+
+
+def make_catalog(tmp_path, fetch=None) -> VoiceCatalog:
+    snapshot = tmp_path / "snapshot.json"
+    snapshot.write_text(json.dumps(SNAPSHOT))
+    return VoiceCatalog(cache_path=str(tmp_path / "voices.json"), snapshot_path=str(snapshot), fetch=fetch)
+
+
+def test_snapshot_is_for_display_only(tmp_path):
+    catalog = make_catalog(tmp_path)
+    assert [v["value"] for v in catalog.find()] == ["en-US-AvaNeural"]
+    assert not catalog.complete
+    # not in the hand-picked list, but not rejected either
+    assert catalog.is_valid("de-DE-KatjaNeural")
+    assert catalog.is_valid("anything")
+    assert not catalog.is_valid("")
+
+
+def test_fetched_catalog_validates_and_is_saved(tmp_path):
+    async def fetch():
+        return FETCHED
+
+    async def scenario():
+        catalog = make_catalog(tmp_path, fetch=fetch)
+        assert await catalog.refresh()
+        return catalog
+
+    catalog = asyncio.run(scenario())
+    assert catalog.complete
+    assert catalog.is_valid("de-DE-KatjaNeural")
+    assert not catalog.is_valid("xx-XX-NobodyNeural")
+    # the next start loads the saved list instead of the snapshot
+    reopened = make_catalog(tmp_path)
+    assert reopened.stats()["source"] == "disk" and reopened.stats()["voices"] == 2
+
+
+def test_ensure_loaded_reads_files_off_the_event_loop(tmp_path, monkeypatch):
+    catalog = make_catalog(tmp_path)
+    threads = []
+    load = catalog._ensure_loaded
+
+    def tracked_load():
+        threads.append(threading.current_thread())
+        load()
+
+    monkeypatch.setattr(catalog, "_ensure_loaded", tracked_load)
+
+    async def scenario():
+        await catalog.ensure_loaded()
+        await catalog.ensure_loaded()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(threads) == 1 and threads[0] is not loop_thread
@@ -0,0 +1,405 @@
+import bisect
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from audio_cache import normalize_chunk_text
+
+
+SLIDE_PAUSE = "__SLIDE_PAUSE__"
+
+SENTENCE_END_RE = re.compile(r"(?<=[\.\?!])\s+")
+
+# match groups of Slide markers (e.g. "Slide 1 Slide 2 Slide 3")
+SLIDE_RE = re.compile(r"(?:Slide\s*\d+\s*){1,}", flags=re.IGNORECASE)
+SLIDE_NUMBER_RE = re.compile(r"\d+")
+
+# one scan finds words (group 1) and sentence gaps (group 2, same as SENTENCE_END_RE)
+TOKEN_RE = re.compile(r"(\w+)|(?<=[\.\?!])(\s+)")
+
+# incremental mode: on average one segment boundary every N sentences
+SEGMENT_SENTENCES = 8
+
+SLIDE_PAUSE_SPLIT_RE = re.compile(r"(?<=__SLIDE_PAUSE__)")
+
+# characters that can appear inside a SLIDE_RE match (case-insensitive "slide",
+# digits, whitespace); a cut right after any other character never splits a match
+SLIDE_SAFE_CUT_RE = re.compile(r"[^sSlLiIdDeE\u0130\u0131\u017f\d\s][sSlLiIdDeE\u0130\u0131\u017f\d\s]*$")
+
+# conservative speaking rate (slow pace) used to turn a playback lead into text
+SPOKEN_CHARS_PER_SECOND = 12.0
+
+
+def preprocess_slides(text: str) -> str:
+    """Replace consecutive slide markers with a slide-pause token."""
+    return SLIDE_RE.sub(SLIDE_PAUSE, text)
+
+
+def preprocess_slides_with_numbers(text: str) -> Tuple[str, List[int]]:
+    """Like `preprocess_slides`, also returning the slide each pause leads into.
+
+    A group such as "Slide 1 Slide 2" is one pause leading into slide 2.
+    """
+    numbers: List[int] = []
+
+    def replace(match: re.Match) -> str:
+        numbers.append(int(SLIDE_NUMBER_RE.findall(match.group(0))[-1]))
+        return SLIDE_PAUSE
+
+    return SLIDE_RE.sub(replace, text), numbers
+
+
+def prepare_text_for_chunk(chunk: str) -> str:
+    """Prepare plain text chunk for edge-tts (avoid raw SSML tags being spoken)."""
+    return chunk.replace(SLIDE_PAUSE, " ")
+
+
+def locate_slides(chunks: List[str], slide_numbers: List[int]) -> List[Dict[str, object]]:
+    """Find where each slide starts in the synthesized chunk sequence.
+
+    Returns `{"number", "chunk", "offset", "fraction"}` per slide, where
+    `chunk` indexes the speakable chunks (empty ones are never synthesized),
+    `offset` is the number of characters of the chunk's spoken text
+    (`prepare_text_for_chunk(chunk).strip()`) before the slide starts and
+    `fraction` is their share of it (0.0 means the slide starts exactly at the
+    chunk boundary).
+    """
+    numbers = iter(slide_numbers)
+    located: List[Dict[str, object]] = []
+    pending: List[Optional[int]] = []
+    speakable = -1
+    for chunk in chunks:
+        spoken = prepare_text_for_chunk(chunk).strip()
+        if not spoken:
+            pending.extend(next(numbers, None) for _ in range(chunk.count(SLIDE_PAUSE)))
+            continue
+        speakable += 1
+        located.extend({"number": n, "chunk": speakable, "offset": 0, "fraction": 0.0} for n in pending)
+        pending = []
+        pos = chunk.find(SLIDE_PAUSE)
+        while pos >= 0:
+            number = next(numbers, None)
+            end = pos + len(SLIDE_PAUSE)
+            if not prepare_text_for_chunk(chunk[end:]).strip():
+                pending.append(number)
+            else:
+                before = len(prepare_text_for_chunk(chunk[:pos]).strip())
+                located.append(
+                    {"number": number, "chunk": speakable, "offset": before, "fraction": before / len(spoken)}
+                )
+            pos = chunk.find(SLIDE_PAUSE, end)
+    # slides announced after the last spoken text have no audio to start at
+    return located
+
+
+def sentence_gaps(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of every sentence gap in `text`."""
+    return [m.span() for m in SENTENCE_END_RE.finditer(text)]
+
+
+def split_at_gaps(text: str, gaps: List[Tuple[int, int]], max_chars: int = 4000) -> List[str]:
+    """Chunk stripped `text` at the last sentence gap inside each window.
+
+    `gaps` are the sentence gaps of `text` in order; each window is resolved
+    with a bisect instead of rescanning it.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    gap_starts = [start for start, _ in gaps]
+    parts: List[str] = []
+    start = 0
+    L = len(text)
+    while start < L:
+        end = min(start + max_chars, L)
+        # last gap whose lookbehind lies inside the window (start + 1 <= s < end)
+        i = bisect.bisect_left(gap_starts, end) - 1
+        if i >= 0 and gap_starts[i] > start:
+            split_at = min(gaps[i][1], end)
+        else:
+            # fallback: hard split
+            split_at = end
+        parts.append(text[start:split_at].strip())
+        start = split_at
+
+        # skip whitespace between chunks
+        while start < L and text[start].isspace():
+            start += 1
+
+    return parts
+
+
+def split_text(text: str, max_chars: int = 4000) -> List[str]:
+    """Split text into chunks (prefer sentence boundaries)."""
+    text = text.strip()
+    return split_at_gaps(text, sentence_gaps(text), max_chars=max_chars)
+
+
+def adaptive_chunks(
+    text: str,
+    gaps: List[Tuple[int, int]],
+    lead_seconds: Callable[[], float] = lambda: 0.0,
+    first_chars: int = 160,
+    growth: float = 2.0,
+    max_chars: int = 4000,
+) -> Iterator[str]:
+    """Chunk stripped `text` for streaming: small first, larger as playback falls behind.
+
+    The first chunk is about one sentence so audio starts quickly. Each later
+    chunk's budget grows by `growth`, or jumps to the speech that fits in the
+    current `lead_seconds()` (audio buffered ahead of playback) when that is
+    larger. Chunks are pulled lazily, so the lead is read when each chunk is
+    scheduled. Splits fall on sentence gaps; a sentence longer than the budget
+    is kept whole unless it exceeds `max_chars`.
+    """
+    gap_starts = [start for start, _ in gaps]
+    planned = float(first_chars)
+    start = 0
+    L = len(text)
+    while start < L:
+        budget = int(min(max_chars, max(planned, lead_seconds() * SPOKEN_CHARS_PER_SECOND)))
+        split_at = split_point(text, gaps, gap_starts, start, budget, max_chars)
+        yield text[start:split_at].strip()
+        start = split_at
+        while start < L and text[start].isspace():
+            start += 1
+        planned *= growth
+
+
+def split_point(
+    text: str,
+    gaps: List[Tuple[int, int]],
+    gap_starts: List[int],
+    start: int,
+    budget: int,
+    max_chars: int,
+    whole_tail: bool = True,
+) -> int:
+    """End of the chunk starting at `start`: the last sentence gap within `budget`.
+
+    A first sentence longer than the budget is kept whole if it fits in
+    `max_chars`; otherwise the chunk is hard split at `max_chars`. With
+    `whole_tail=False` a tail that fits is still split at its last gap, as
+    `split_at_gaps` does after the first chunk.
+    """
+    L = len(text)
+    end = min(start + budget, L)
+    if end == L and whole_tail:
+        return L
+    i = bisect.bisect_left(gap_starts, end) - 1
+    if i >= 0 and gap_starts[i] > start:
+        return gaps[i][1]
+    j = bisect.bisect_right(gap_starts, start)
+    if j < len(gaps) and gap_starts[j] < start + max_chars:
+        return gaps[j][1]
+    return min(start + max_chars, L)
+
+
+class StreamingChunker:
+    """Incremental `preprocess_slides` + chunking for text that arrives in pieces.
+
+    `feed` returns the chunks sealed by the new text and `finish` the rest.
+    With the default `first_chars=None` the chunks equal `split_text` of the
+    preprocessed whole; otherwise they follow `adaptive_chunks`. Only the
+    unsealed tail is kept, so memory is bounded by the chunk size rather than
+    the document size.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = 4000,
+        first_chars: Optional[int] = None,
+        growth: float = 2.0,
+        lead_seconds: Callable[[], float] = lambda: 0.0,
+    ):
+        self.max_chars = max_chars
+        self.growth = growth if first_chars else 1.0
+        self.lead_seconds = lead_seconds
+        self._planned = float(first_chars or max_chars)
+        self._raw = ""  # not yet preprocessed (may end inside a slide marker)
+        self._pending = ""  # preprocessed, not yet sealed
+        self._sealed_any = False
+        self.chars = 0  # preprocessed characters seen
+
+    def feed(self, text: str) -> List[str]:
+        self._raw += text
+        match = SLIDE_SAFE_CUT_RE.search(self._raw)
+        if match is not None:
+            cut = match.start() + 1
+        elif len(self._raw) > self.max_chars:
+            # a long run of digits/whitespace: cut anyway to keep memory bounded
+            cut = len(self._raw)
+        else:
+            return []
+        self._push(self._raw[:cut])
+        self._raw = self._raw[cut:]
+        return self._seal(final=False)
+
+    def finish(self) -> List[str]:
+        self._push(self._raw)
+        self._raw = ""
+        return self._seal(final=True)
+
+    def _push(self, raw: str) -> None:
+        processed = preprocess_slides(raw)
+        self.chars += len(processed)
+        self._pending = (self._pending + processed) if self._pending else processed.lstrip()
+
+    def _seal(self, final: bool) -> List[str]:
+        sealed: List[str] = []
+        while True:
+            text = self._pending.rstrip() if final else self._pending
+            content = len(text) if final else len(text.rstrip())
+            if content == 0:
+                self._pending = ""
+                return sealed
+            budget = int(min(self.max_chars, max(self._planned, self.lead_seconds() * SPOKEN_CHARS_PER_SECOND)))
+            gaps = sentence_gaps(text)
+            gap_starts = [start for start, _ in gaps]
+            if not final:
+                # wait until later text cannot change where this chunk ends
+                has_gap = bisect.bisect_left(gap_starts, self.max_chars) > bisect.bisect_right(gap_starts, 0)
+                if content <= budget or not (has_gap or content > self.max_chars):
+                    return sealed
+            # fixed chunks match split_text, which splits a fitting tail unless it is the whole text
+            whole_tail = self.growth != 1.0 or not self._sealed_any
+            split_at = split_point(text, gaps, gap_starts, 0, budget, self.max_chars, whole_tail)
+            self._sealed_any = True
+            sealed.append(text[:split_at].strip())
+            self._pending = text[split_at:].lstrip()
+            self._planned = min(self.max_chars, self._planned * self.growth)
+
+
+def segment_text(text: str, max_chars: int = 4000) -> List[str]:
+    """Split preprocessed text into stable segments for incremental re-rendering.
+
+    Slide pauses always close a segment. Within a slide, a segment closes after
+    any sentence whose content hash hits 1 in `SEGMENT_SENTENCES`, so boundaries
+    depend only on nearby text: editing one sentence changes only its segment.
+    """
+    segments: List[str] = []
+    for piece in SLIDE_PAUSE_SPLIT_RE.split(text):
+        current: List[str] = []
+        size = 0
+        for sentence in SENTENCE_END_RE.split(piece):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if current and size + len(sentence) + 1 > max_chars:
+                segments.append(" ".join(current))
+                current, size = [], 0
+            if len(sentence) > max_chars:
+                segments.extend(split_text(sentence, max_chars=max_chars))
+                continue
+            current.append(sentence)
+            size += len(sentence) + 1
+            if zlib.crc32(normalize_chunk_text(sentence).encode("utf-8")) % SEGMENT_SENTENCES == 0:
+                segments.append(" ".join(current))
+                current, size = [], 0
+        if current:
+            segments.append(" ".join(current))
+    return segments
+
+
+def adaptive_segments(segments: List[str], first_chars: int = 160, growth: float = 2.0, max_chars: int = 4000) -> List[str]:
+    """Incremental segments with the first one split like `adaptive_chunks` for a fast start.
+
+    The split ignores the playback lead, so it depends only on the first
+    segment's text and the pieces stay as cacheable as the segment itself.
+    """
+    if not segments:
+        return []
+    head = segments[0]
+    return list(adaptive_chunks(head, sentence_gaps(head), first_chars=first_chars, growth=growth, max_chars=max_chars)) + segments[1:]
+
+
+@dataclass
+class TextAnalysis:
+    """Everything the endpoints need to know about one script."""
+
+    text: str  # preprocessed (slide markers -> SLIDE_PAUSE)
+    words: int
+    sentences: int
+    slide_pauses: int
+    slide_numbers: List[int]
+    chunks: List[str]
+    max_chars: int
+    gaps: List[Tuple[int, int]] = field(default_factory=list, repr=False)  # sentence gaps of text.strip()
+    _segments: Optional[List[str]] = field(default=None, repr=False)
+
+    @property
+    def chars(self) -> int:
+        return len(self.text)
+
+    @property
+    def segments(self) -> List[str]:
+        """Stable incremental-mode segments (computed on first use)."""
+        if self._segments is None:
+            self._segments = segment_text(self.text, max_chars=self.max_chars)
+        return self._segments
+
+
+def tokenize(text: str, max_chars: int = 4000) -> TextAnalysis:
+    """Analyze raw text in one tokenizer pass over its preprocessed form."""
+    preprocessed, slide_numbers = preprocess_slides_with_numbers(text)
+    words = 0
+    slide_pauses = 0
+    gaps: List[Tuple[int, int]] = []
+    for match in TOKEN_RE.finditer(preprocessed):
+        word = match.group(1)
+        if word is None:
+            gaps.append(match.span())
+            continue
+        # the pause token is matched as a word (and counted as one, as before)
+        words += 1
+        if "__" in word:
+            slide_pauses += word.count(SLIDE_PAUSE)
+
+    body = preprocessed.strip()
+    lead = len(preprocessed) - len(preprocessed.lstrip())
+    body_gaps = [(s - lead, e - lead) for s, e in gaps if s - lead < len(body)]
+    return TextAnalysis(
+        text=preprocessed,
+        words=words,
+        sentences=len(gaps),
+        slide_pauses=slide_pauses,
+        slide_numbers=slide_numbers,
+        chunks=split_at_gaps(body, body_gaps, max_chars=max_chars),
+        max_chars=max_chars,
+        gaps=body_gaps,
+    )
+
+
+class TextAnalysisCache:
+    """Small LRU of TextAnalysis results keyed by content hash."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, TextAnalysis]" = OrderedDict()
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def analyze(self, text: str, max_chars: int = 4000) -> TextAnalysis:
+        key = hashlib.sha256(f"{max_chars}\0{text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return analysis
+            self.counters["misses"] += 1
+
+        analysis = tokenize(text, max_chars=max_chars)
+        with self._lock:
+            self._entries[key] = analysis
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return analysis
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries)}
@@ -0,0 +1,654 @@
+import asyncio
+import json
+import ssl
+import time
+from collections import deque
+from contextlib import aclosing
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, unescape
+
+import aiohttp
+import certifi
+import edge_tts
+from edge_tts.exceptions import NoAudioReceived, UnexpectedResponse, UnknownResponse, WebSocketError
+
+from latency import LatencyWindow
+from metrics import record_stage
+from scheduler import UpstreamScheduler
+
+
+# audio-24khz-48kbitrate-mono-mp3 is CBR, so byte counts convert exactly to time
+TICKS_PER_SECOND = 10_000_000
+MP3_BITRATE_BPS = 48_000
+MP3_FRAME_BYTES = 144  # 576 samples at 24 kHz, no padding at this rate
+
+# edge-tts limit for one SSML request
+MAX_SSML_TEXT_BYTES = 4096
+
+
+def bytes_to_ticks(n_bytes: int) -> int:
+    return n_bytes * 8 * TICKS_PER_SECOND // MP3_BITRATE_BPS
+
+
+def ticks_to_frame_bytes(ticks: int) -> int:
+    """Byte offset of the last MP3 frame boundary at or before `ticks`."""
+    n_bytes = max(0, ticks) * MP3_BITRATE_BPS // (8 * TICKS_PER_SECOND)
+    return n_bytes - n_bytes % MP3_FRAME_BYTES
+
+
+def edge_internals() -> SimpleNamespace:
+    """The private edge-tts helpers the pooled backend speaks the protocol with.
+
+    Imported on first use: they are not public API and may move between
+    releases, which must not break the plain `edge` backend. Raises ImportError.
+    """
+    from edge_tts.communicate import (
+        connect_id,
+        date_to_string,
+        mkssml,
+        remove_incompatible_characters,
+        split_text_by_byte_length,
+        ssml_headers_plus_data,
+    )
+    from edge_tts.constants import SEC_MS_GEC_VERSION, WSS_HEADERS, WSS_URL
+    from edge_tts.data_classes import TTSConfig
+    from edge_tts.drm import DRM
+
+    return SimpleNamespace(
+        connect_id=connect_id,
+        date_to_string=date_to_string,
+        mkssml=mkssml,
+        remove_incompatible_characters=remove_incompatible_characters,
+        split_text_by_byte_length=split_text_by_byte_length,
+        ssml_headers_plus_data=ssml_headers_plus_data,
+        SEC_MS_GEC_VERSION=SEC_MS_GEC_VERSION,
+        WSS_HEADERS=WSS_HEADERS,
+        WSS_URL=WSS_URL,
+        TTSConfig=TTSConfig,
+        DRM=DRM,
+    )
+
+
+class TTSBackend:
+    """Source of synthesis events for one text chunk.
+
+    `stream` yields edge-tts style events: `{"type": "audio", "data": bytes}`
+    and `{"type": "WordBoundary" | "SentenceBoundary", "offset", "duration",
+    "text"}` with offsets in 100 ns ticks from the start of the chunk.
+    """
+
+    name = "base"
+
+    def stream(
+        self, text: str, voice: str, rate: str, boundary: str = "SentenceBoundary"
+    ) -> AsyncIterator[dict]:
+        raise NotImplementedError
+
+    async def warm(self, connections: int = 1) -> None:
+        """Prepare for the first request (e.g. open connections); optional."""
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, object]:
+        return {"backend": self.name}
+
+
+class EdgeCommunicateBackend(TTSBackend):
+    """One fresh edge-tts session per chunk (edge_tts.Communicate)."""
+
+    name = "edge"
+
+    def __init__(self, fallback_reason: Optional[str] = None):
+        # set when another backend was requested but could not be built
+        self.fallback_reason = fallback_reason
+
+    async def stream(
+        self, text: str, voice: str, rate: str, boundary: str = "SentenceBoundary"
+    ) -> AsyncIterator[dict]:
+        communicator = edge_tts.Communicate(text, voice=voice, rate=rate, boundary=boundary)
+        async for event in communicator.stream():
+            yield event
+
+    def stats(self) -> Dict[str, object]:
+        if self.fallback_reason is None:
+            return super().stats()
+        return {**super().stats(), "fallback_reason": self.fallback_reason}
+
+
+class _PooledConnection:
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse):
+        self.ws = ws
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+        self.boundary: Optional[str] = None
+
+
+class PooledWebSocketBackend(TTSBackend):
+    """Speaks the edge read-aloud websocket protocol over pooled connections.
+
+    Each synthesis is one `speech.config` + `ssml` turn ending in `turn.end`;
+    after a clean turn the socket goes back to the pool for the next chunk or
+    request. Pooled sockets are health-checked on checkout (open, under
+    `max_age` and `max_uses`, used within `idle_timeout`) and idle ones beyond
+    `idle_timeout` are closed. A reused socket that fails before producing any
+    event is replaced by a fresh one transparently.
+    """
+
+    def __init__(
+        self,
+        url_factory: Callable[[], str],
+        headers_factory: Callable[[], Dict[str, str]] = dict,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        name: str = "pool",
+        max_idle: int = 8,
+        idle_timeout: float = 60.0,
+        max_age: float = 600.0,
+        max_uses: int = 500,
+        connect_timeout: float = 10.0,
+        receive_timeout: float = 60.0,
+        heartbeat: Optional[float] = 20.0,
+        on_forbidden: Optional[Callable[[aiohttp.ClientResponseError], None]] = None,
+    ):
+        self.name = name
+        self.url_factory = url_factory
+        self.headers_factory = headers_factory
+        self.ssl_context = ssl_context
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.connect_timeout = connect_timeout
+        self.receive_timeout = receive_timeout
+        self.heartbeat = heartbeat
+        self.on_forbidden = on_forbidden
+        self._edge = edge_internals()
+        self._idle: deque = deque()
+        self._active = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop = None
+        self.counters: Dict[str, int] = {
+            "connects": 0,
+            "reuses": 0,
+            "unhealthy_discards": 0,
+            "idle_evictions": 0,
+            "stale_retries": 0,
+            "turns": 0,
+        }
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # connections belong to the loop that opened them
+            self._idle.clear()
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.connect_timeout),
+            )
+        return self._session
+
+    def _healthy(self, conn: _PooledConnection) -> bool:
+        now = time.monotonic()
+        return (
+            not conn.ws.closed
+            and conn.ws.exception() is None
+            and now - conn.last_used < self.idle_timeout
+            and now - conn.created_at < self.max_age
+            and conn.uses < self.max_uses
+        )
+
+    async def _connect(self) -> _PooledConnection:
+        session = self._get_session()
+        for attempt in range(2):
+            started = time.perf_counter()
+            try:
+                ws = await session.ws_connect(
+                    self.url_factory(),
+                    headers=self.headers_factory(),
+                    ssl=self.ssl_context,
+                    compress=15,
+                    heartbeat=self.heartbeat,
+                )
+            except aiohttp.ClientResponseError as exc:
+                if exc.status != 403 or self.on_forbidden is None or attempt:
+                    raise
+                self.on_forbidden(exc)
+                continue
+            self.counters["connects"] += 1
+            record_stage("upstream_connect", time.perf_counter() - started)
+            return _PooledConnection(ws)
+        raise WebSocketError("Could not connect")
+
+    async def _acquire(self) -> "tuple[_PooledConnection, bool]":
+        self._get_session()
+        self.evict_idle()
+        while self._idle:
+            conn = self._idle.pop()
+            if self._healthy(conn):
+                self.counters["reuses"] += 1
+                self._active += 1
+                return conn, True
+            self.counters["unhealthy_discards"] += 1
+            await conn.ws.close()
+        conn = await self._connect()
+        self._active += 1
+        return conn, False
+
+    async def _release(self, conn: _PooledConnection, reusable: bool) -> None:
+        self._active -= 1
+        conn.last_used = time.monotonic()
+        if reusable and len(self._idle) < self.max_idle and self._healthy(conn):
+            self._idle.append(conn)
+        else:
+            await conn.ws.close()
+
+    def evict_idle(self) -> None:
+        """Close pooled sockets that have been idle longer than `idle_timeout`."""
+        now = time.monotonic()
+        keep = deque()
+        for conn in self._idle:
+            if now - conn.last_used >= self.idle_timeout or conn.ws.closed:
+                self.counters["idle_evictions"] += 1
+                asyncio.ensure_future(conn.ws.close())
+            else:
+                keep.append(conn)
+        self._idle = keep
+
+    async def warm(self, connections: int = 1) -> None:
+        """Open sockets ahead of the first request."""
+        self._get_session()
+        while len(self._idle) < min(connections, self.max_idle):
+            self._idle.append(await self._connect())
+
+    async def stream(
+        self, text: str, voice: str, rate: str, boundary: str = "SentenceBoundary"
+    ) -> AsyncIterator[dict]:
+        edge = self._edge
+        tts_config = edge.TTSConfig(voice, rate, "+0%", "+0Hz", boundary)
+        audio_bytes = 0
+        for partial_text in edge.split_text_by_byte_length(
+            escape(edge.remove_incompatible_characters(text)), MAX_SSML_TEXT_BYTES
+        ):
+            offset = bytes_to_ticks(audio_bytes)
+            for attempt in range(2):
+                conn, reused = await self._acquire()
+                clean = False
+                produced = False
+                try:
+                    async for event in self._turn(conn, tts_config, partial_text, offset):
+                        produced = True
+                        if event["type"] == "audio":
+                            audio_bytes += len(event["data"])
+                        yield event
+                    clean = True
+                    break
+                except (aiohttp.ClientError, WebSocketError, asyncio.TimeoutError):
+                    if produced or not reused or attempt:
+                        raise
+                    self.counters["stale_retries"] += 1
+                finally:
+                    await self._release(conn, clean)
+
+    async def _turn(
+        self, conn: _PooledConnection, tts_config, partial_text: bytes, offset: int
+    ) -> AsyncIterator[dict]:
+        edge = self._edge
+        ws = conn.ws
+        conn.uses += 1
+        self.counters["turns"] += 1
+        if conn.boundary != tts_config.boundary:
+            word_boundary = tts_config.boundary == "WordBoundary"
+            await ws.send_str(
+                f"X-Timestamp:{edge.date_to_string()}\r\n"
+                "Content-Type:application/json; charset=utf-8\r\n"
+                "Path:speech.config\r\n\r\n"
+                '{"context":{"synthesis":{"audio":{"metadataoptions":{'
+                f'"sentenceBoundaryEnabled":"{str(not word_boundary).lower()}",'
+                f'"wordBoundaryEnabled":"{str(word_boundary).lower()}"'
+                "},"
+                '"outputFormat":"audio-24khz-48kbitrate-mono-mp3"'
+                "}}}}\r\n"
+            )
+            conn.boundary = tts_config.boundary
+        await ws.send_str(
+            edge.ssml_headers_plus_data(edge.connect_id(), edge.date_to_string(), edge.mkssml(tts_config, partial_text))
+        )
+
+        audio_received = False
+        while True:
+            message = await ws.receive(timeout=self.receive_timeout)
+            if message.type == aiohttp.WSMsgType.TEXT:
+                head, _, body = message.data.partition("\r\n\r\n")
+                path = parse_headers(head).get("Path")
+                if path == "audio.metadata":
+                    for meta in json.loads(body)["Metadata"]:
+                        if meta["Type"] in ("WordBoundary", "SentenceBoundary"):
+                            yield {
+                                "type": meta["Type"],
+                                "offset": meta["Data"]["Offset"] + offset,
+                                "duration": meta["Data"]["Duration"],
+                                "text": unescape(meta["Data"]["text"]["Text"]),
+                            }
+                elif path == "turn.end":
+                    break
+                elif path not in ("response", "turn.start"):
+                    raise UnknownResponse(f"Unknown path received: {path}")
+            elif message.type == aiohttp.WSMsgType.BINARY:
+                data = message.data
+                if len(data) < 2:
+                    raise UnexpectedResponse("Binary message is missing the header length.")
+                header_length = int.from_bytes(data[:2], "big")
+                headers = parse_headers(data[2:2 + header_length].decode("utf-8", "replace"))
+                if headers.get("Path") != "audio":
+                    raise UnexpectedResponse("Received binary message, but the path is not audio.")
+                audio = data[2 + header_length:]
+                if headers.get("Content-Type") == "audio/mpeg" and audio:
+                    audio_received = True
+                    yield {"type": "audio", "data": audio}
+            elif message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.CLOSED):
+                raise WebSocketError("Connection closed by the service")
+            elif message.type == aiohttp.WSMsgType.ERROR:
+                raise WebSocketError(str(message.data or "Unknown error"))
+
+        if not audio_received:
+            raise NoAudioReceived("No audio was received. Please verify that your parameters are correct.")
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._idle.pop().ws.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "backend": self.name,
+            **self.counters,
+            "idle_connections": len(self._idle),
+            "active_connections": self._active,
+        }
+
+
+# upstream failures worth another attempt (anything else, e.g. NoAudioReceived, is final)
+RETRYABLE_ERRORS = (aiohttp.ClientError, WebSocketError, asyncio.TimeoutError, ConnectionError)
+
+_STREAM_END = object()
+
+
+class _Attempt:
+    """One upstream stream pumped into a queue by a background task."""
+
+    def __init__(
+        self,
+        backend: TTSBackend,
+        text: str,
+        voice: str,
+        rate: str,
+        boundary: str,
+        on_done: Optional[Callable[[], None]] = None,
+    ):
+        self.started = time.perf_counter()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.ensure_future(self._pump(backend.stream(text, voice=voice, rate=rate, boundary=boundary)))
+        if on_done is not None:
+            # a done callback also runs when the task is cancelled before it starts
+            self.task.add_done_callback(lambda _task: on_done())
+
+    async def _pump(self, events: AsyncIterator[dict]) -> None:
+        try:
+            async for event in events:
+                self.queue.put_nowait(event)
+        except Exception as exc:
+            self.queue.put_nowait(exc)
+            return
+        self.queue.put_nowait(_STREAM_END)
+
+    def cancel(self) -> None:
+        self.task.cancel()
+
+
+class HedgedBackend(TTSBackend):
+    """Wraps a backend with hedged first responses and resumable streams.
+
+    If a chunk's first event has not arrived within the `percentile` of recent
+    first-response times (`initial_deadline` until `min_samples` are seen, never
+    below `min_deadline`), a duplicate request is sent and whichever responds
+    first is kept. The duplicate takes a `scheduler` slot with `try_acquire`;
+    when none is free (upstream is saturated or clients are queued) the hedge
+    is skipped and checked again after another deadline.
+
+    When a stream breaks or stalls for `stall_timeout`, the rest of the chunk
+    is requested from the last boundary event whose word is located in the
+    text. Audio is forwarded as it arrives except for at most `max_hold`
+    seconds past that boundary; the resumed stream skips the audio that was
+    already forwarded, and its boundary offsets are shifted to follow it.
+    """
+
+    def __init__(
+        self,
+        inner: TTSBackend,
+        percentile: float = 95.0,
+        min_deadline: float = 0.3,
+        initial_deadline: float = 2.5,
+        min_samples: int = 20,
+        max_retries: int = 2,
+        stall_timeout: float = 10.0,
+        max_hold: float = 0.25,
+        scheduler: Optional[UpstreamScheduler] = None,
+    ):
+        self.inner = inner
+        self.name = inner.name
+        self.percentile = percentile
+        self.min_deadline = min_deadline
+        self.initial_deadline = initial_deadline
+        self.min_samples = min_samples
+        self.max_retries = max_retries
+        self.stall_timeout = stall_timeout
+        # whole MP3 frames, so every cut (and skip after a resume) lands on a frame boundary
+        self.max_hold_bytes = ticks_to_frame_bytes(int(max_hold * TICKS_PER_SECOND))
+        self.scheduler = scheduler
+        self.first_response = LatencyWindow()
+        self.counters: Dict[str, int] = {
+            "hedges": 0,
+            "hedges_skipped": 0,
+            "hedge_wins": 0,
+            "retries": 0,
+            "resumes": 0,
+        }
+
+    def deadline(self) -> float:
+        """Seconds to wait for a first event before hedging."""
+        if self.first_response.count < self.min_samples:
+            return self.initial_deadline
+        return max(self.min_deadline, self.first_response.percentile(self.percentile))
+
+    async def stream(
+        self, text: str, voice: str, rate: str, boundary: str = "SentenceBoundary"
+    ) -> AsyncIterator[dict]:
+        remaining = text
+        base_ticks = 0
+        # bytes at the start of the next attempt that were already forwarded
+        skip = 0
+        retries = 0
+        while True:
+            # positions are bytes of this attempt's audio: `received` so far, forwarded up to `forwarded`
+            received = forwarded = skip
+            held = bytearray()
+            # boundaries of this attempt not yet yielded: (event, position in `remaining`)
+            marks: List[Tuple[dict, int]] = []
+            # latest boundary located in `remaining`: (audio byte position, text position)
+            resume_at: Tuple[int, int] = (0, 0)
+            cursor = 0
+            try:
+                async with aclosing(self._first_to_respond(remaining, voice, rate, boundary)) as events:
+                    async for event in events:
+                        if event["type"] == "audio":
+                            data = event["data"]
+                            if skip:
+                                dropped = min(skip, len(data))
+                                data = data[dropped:]
+                                skip -= dropped
+                            held += data
+                            received += len(data)
+                        else:
+                            pos = remaining.find(event["text"], cursor) if event["text"] else -1
+                            if pos >= 0:
+                                cursor = pos + len(event["text"])
+                                resume_at = (ticks_to_frame_bytes(event["offset"]), pos)
+                            marks.append((event, pos))
+                        # forward everything before the resume point, and beyond it all but `max_hold`
+                        end = min(received, max(resume_at[0], received - self.max_hold_bytes))
+                        end -= end % MP3_FRAME_BYTES
+                        if end > forwarded:
+                            yield {"type": "audio", "data": bytes(held[:end - forwarded])}
+                            del held[:end - forwarded]
+                            forwarded = end
+                        # boundaries before the resume point are final; it is re-sent after a resume
+                        cut = next((i for i in range(len(marks) - 1, -1, -1) if marks[i][1] >= 0), 0)
+                        for mark, _ in marks[:cut]:
+                            yield {**mark, "offset": mark["offset"] + base_ticks}
+                        del marks[:cut]
+            except RETRYABLE_ERRORS:
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+                self.counters["retries"] += 1
+                if forwarded:
+                    self.counters["resumes"] += 1
+                    byte_pos, text_pos = resume_at
+                    restart = min(byte_pos, forwarded)
+                    remaining = remaining[text_pos:]
+                    base_ticks += bytes_to_ticks(restart)
+                    skip = forwarded - restart
+                    if not remaining.strip():
+                        return
+                continue
+            if held:
+                yield {"type": "audio", "data": bytes(held)}
+            for mark, _ in marks:
+                yield {**mark, "offset": mark["offset"] + base_ticks}
+            return
+
+    async def _first_to_respond(self, text: str, voice: str, rate: str, boundary: str) -> AsyncIterator[dict]:
+        """Events of the first attempt to respond, hedging once after `deadline()`."""
+        attempts = [_Attempt(self.inner, text, voice, rate, boundary)]
+        getters = {asyncio.ensure_future(attempts[0].queue.get()): attempts[0]}
+        winner = first = None
+        hedge_at = attempts[0].started + self.deadline()
+        try:
+            while winner is None:
+                wait = None
+                if len(attempts) == 1:
+                    wait = max(0.0, hedge_at - time.perf_counter())
+                done, _ = await asyncio.wait(getters, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if self.scheduler is not None and not self.scheduler.try_acquire():
+                        # no spare upstream capacity: a hedge would add load where it hurts most
+                        self.counters["hedges_skipped"] += 1
+                        hedge_at = time.perf_counter() + self.deadline()
+                        continue
+                    self.counters["hedges"] += 1
+                    release = self.scheduler.release if self.scheduler is not None else None
+                    hedge = _Attempt(self.inner, text, voice, rate, boundary, on_done=release)
+                    attempts.append(hedge)
+                    getters[asyncio.ensure_future(hedge.queue.get())] = hedge
+                    continue
+                for getter in done:
+                    attempt = getters.pop(getter)
+                    item = getter.result()
+                    if isinstance(item, Exception) or item is _STREAM_END:
+                        # failed (or empty) before responding: let a pending hedge win instead
+                        if getters:
+                            continue
+                        if item is _STREAM_END:
+                            return
+                        raise item
+                    if winner is None:
+                        winner, first = attempt, item
+            self.first_response.add(time.perf_counter() - winner.started)
+            if winner is not attempts[0]:
+                self.counters["hedge_wins"] += 1
+            for getter in getters:
+                getter.cancel()
+            for attempt in attempts:
+                if attempt is not winner:
+                    attempt.cancel()
+
+            item = first
+            while item is not _STREAM_END:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                try:
+                    item = await asyncio.wait_for(winner.queue.get(), self.stall_timeout)
+                except asyncio.TimeoutError:
+                    raise WebSocketError("Upstream stream stalled") from None
+        finally:
+            for getter in getters:
+                getter.cancel()
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def warm(self, connections: int = 1) -> None:
+        await self.inner.warm(connections)
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            **self.inner.stats(),
+            "hedging": {
+                **self.counters,
+                "deadline_ms": round(self.deadline() * 1000.0, 1),
+                "first_response": self.first_response.summary(),
+            },
+        }
+
+
+def parse_headers(head: str) -> Dict[str, str]:
+    headers = {}
+    for line in head.split("\r\n"):
+        key, sep, value = line.partition(":")
+        if sep:
+            headers[key.strip()] = value.strip()
+    return headers
+
+
+def edge_wss_url() -> str:
+    edge = edge_internals()
+    return (
+        f"{edge.WSS_URL}&ConnectionId={edge.connect_id()}"
+        f"&Sec-MS-GEC={edge.DRM.generate_sec_ms_gec()}"
+        f"&Sec-MS-GEC-Version={edge.SEC_MS_GEC_VERSION}"
+    )
+
+
+def make_backend(name: str, local_url: str = "ws://127.0.0.1:8765/tts", **pool_options) -> TTSBackend:
+    """Build a backend by name: `edge` (default), `edge-pool` or `local`.
+
+    `edge-pool` is opt-in and falls back to `edge` when the edge-tts internals
+    it needs are missing from the installed release.
+    """
+    name = (name or "edge").lower()
+    if name == "edge":
+        # one fresh session per chunk; pooling options do not apply
+        return EdgeCommunicateBackend()
+    if name == "local":
+        return PooledWebSocketBackend(url_factory=lambda: local_url, name="local", **pool_options)
+    if name == "edge-pool":
+        try:
+            edge = edge_internals()
+        except ImportError as exc:
+            return EdgeCommunicateBackend(fallback_reason=f"edge-pool unavailable: {exc}")
+        return PooledWebSocketBackend(
+            url_factory=edge_wss_url,
+            headers_factory=lambda: edge.DRM.headers_with_muid(edge.WSS_HEADERS),
+            ssl_context=ssl.create_default_context(cafile=certifi.where()),
+            name="edge-pool",
+            on_forbidden=edge.DRM.handle_client_response_error,
+            **pool_options,
+        )
+    raise ValueError(f"Unknown TTS backend: {name}")
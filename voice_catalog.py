@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+FRIENDLY_NAME_RE = re.compile(r"^Microsoft (.+?) Online")
+
+
+def voice_summary(voice: dict) -> Dict[str, object]:
+    """Compact public form of a catalog entry (`name`/`value` as in the original curated list)."""
+    short = voice["ShortName"]
+    match = FRIENDLY_NAME_RE.match(voice.get("FriendlyName", ""))
+    return {
+        "name": f"{match.group(1) if match else short} ({voice['Locale']})",
+        "value": short,
+        "locale": voice["Locale"],
+        "gender": voice.get("Gender"),
+        "styles": voice_styles(voice),
+    }
+
+
+def voice_styles(voice: dict) -> List[str]:
+    """Content categories and personalities from the voice tags (the list has no SSML styles)."""
+    tags = voice.get("VoiceTag") or {}
+    return list(tags.get("ContentCategories") or []) + list(tags.get("VoicePersonalities") or [])
+
+
+class VoiceCatalog:
+    """The edge voice list, cached on disk and indexed by locale, gender and style.
+
+    Loads `cache_path` (written after every successful fetch) or, failing
+    that, the bundled `snapshot_path`. Once the data is older than
+    `ttl_seconds` it is still served while one background fetch replaces it
+    (stale-while-revalidate); a failed fetch is retried after
+    `retry_seconds`. The bundled snapshot is a short hand-picked list for
+    display only; voices are validated only against a fetched catalog (live
+    or from disk).
+
+    Reading the files is blocking: on the event loop, `await ensure_loaded()`
+    first, which does it on a worker thread.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        snapshot_path: str,
+        ttl_seconds: float = 24 * 3600,
+        retry_seconds: float = 300,
+        fetch: Optional[Callable[[], Awaitable[List[dict]]]] = None,
+    ):
+        self.cache_path = cache_path
+        self.snapshot_path = snapshot_path
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._refresh: Optional[asyncio.Task] = None
+        self._last_attempt = 0.0
+        self.counters: Dict[str, int] = {"refreshes": 0, "refresh_errors": 0}
+        self._install([], 0.0, "empty")
+
+    def _install(self, voices: List[dict], fetched_at: float, source: str) -> None:
+        voices = [v for v in voices if v.get("ShortName") and v.get("Locale")]
+        by_locale: Dict[str, List[int]] = {}
+        by_language: Dict[str, List[int]] = {}
+        by_gender: Dict[str, List[int]] = {}
+        by_style: Dict[str, List[int]] = {}
+        for i, voice in enumerate(voices):
+            by_locale.setdefault(voice["Locale"].lower(), []).append(i)
+            by_language.setdefault(voice["Locale"].split("-")[0].lower(), []).append(i)
+            by_gender.setdefault((voice.get("Gender") or "").lower(), []).append(i)
+            for style in voice_styles(voice):
+                by_style.setdefault(style.lower(), []).append(i)
+        canonical = json.dumps(voices, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        state = {
+            "voices": voices,
+            "summaries": [voice_summary(v) for v in voices],
+            "names": {v["ShortName"]: i for i, v in enumerate(voices)},
+            "by_locale": by_locale,
+            "by_language": by_language,
+            "by_gender": by_gender,
+            "by_style": by_style,
+            "etag": '"' + hashlib.sha256(canonical).hexdigest()[:20] + '"',
+            "fetched_at": fetched_at,
+            "source": source,
+        }
+        # readers take one reference, so a refresh never shows them a half-built index
+        self._state = state
+
+    async def ensure_loaded(self) -> None:
+        """Load the saved catalog (or the snapshot) on a worker thread, once."""
+        if not self._loaded:
+            await asyncio.to_thread(self._ensure_loaded)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for path, source in ((self.cache_path, "disk"), (self.snapshot_path, "snapshot")):
+                try:
+                    with open(path, encoding="utf-8") as fh:
+                        data = json.load(fh)
+                except (OSError, ValueError):
+                    continue
+                if isinstance(data, list):
+                    data = {"voices": data}
+                # the bundled snapshot carries no fetch time, so it is stale from the start
+                fetched_at = data.get("fetched_at", 0.0) if source == "disk" else 0.0
+                self._install(data.get("voices") or [], fetched_at, source)
+                break
+            self._loaded = True
+
+    @property
+    def etag(self) -> str:
+        self._ensure_loaded()
+        return self._state["etag"]
+
+    def etag_for(self, *filters: Optional[str]) -> str:
+        """ETag of one filtered view: the catalog etag plus the (case-folded) filters."""
+        query = "\0".join(f or "" for f in filters).lower()
+        return self.etag[:-1] + "-" + hashlib.sha256(query.encode("utf-8")).hexdigest()[:8] + '"'
+
+    @property
+    def complete(self) -> bool:
+        """True when the catalog came from the voice list service rather than the bundled snapshot."""
+        self._ensure_loaded()
+        return self._state["source"] in ("disk", "live")
+
+    def is_stale(self) -> bool:
+        self._ensure_loaded()
+        return time.time() - self._state["fetched_at"] >= self.ttl_seconds
+
+    def refresh_if_stale(self) -> None:
+        """Start one background fetch when the data is stale (call from the event loop)."""
+        if self._fetch is None or not self.is_stale():
+            return
+        if self._refresh is not None and not self._refresh.done():
+            return
+        if time.monotonic() - self._last_attempt < self.retry_seconds and self._last_attempt:
+            return
+        self._last_attempt = time.monotonic()
+        self._refresh = asyncio.ensure_future(self.refresh())
+
+    async def refresh(self) -> bool:
+        """Fetch the catalog now; on failure the current data is kept."""
+        await self.ensure_loaded()
+        try:
+            voices = await self._fetch()
+        except Exception:
+            self.counters["refresh_errors"] += 1
+            return False
+        fetched_at = time.time()
+        self._install(voices, fetched_at, "live")
+        self.counters["refreshes"] += 1
+        await asyncio.to_thread(self._save, voices, fetched_at)
+        return True
+
+    def _save(self, voices: List[dict], fetched_at: float) -> None:
+        directory = os.path.dirname(self.cache_path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"fetched_at": fetched_at, "voices": voices}, fh)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass
+
+    def find(self, locale: Optional[str] = None, gender: Optional[str] = None, style: Optional[str] = None) -> List[dict]:
+        """Summaries matching every given filter, in catalog order.
+
+        `locale` is a full locale (`en-GB`) or a language (`en`); all filters
+        are case-insensitive.
+        """
+        self._ensure_loaded()
+        state = self._state
+        selected: Optional[set] = None
+        if locale:
+            key = locale.lower()
+            index = state["by_locale"] if "-" in key else state["by_language"]
+            selected = set(index.get(key, ()))
+        for value, index in ((gender, state["by_gender"]), (style, state["by_style"])):
+            if value:
+                matches = set(index.get(value.lower(), ()))
+                selected = matches if selected is None else selected & matches
+        if selected is None:
+            return state["summaries"]
+        return [state["summaries"][i] for i in sorted(selected)]
+
+    def is_known(self, name: str) -> bool:
+        self._ensure_loaded()
+        return name in self._state["names"]
+
+    def is_valid(self, name: Optional[str]) -> bool:
+        """Known voice; while only the snapshot is loaded, any name (upstream decides)."""
+        if not name:
+            return False
+        return self.is_known(name) or not self.complete
+
+    def stats(self) -> Dict[str, object]:
+        self._ensure_loaded()
+        state = self._state
+        return {
+            **self.counters,
+            "voices": len(state["voices"]),
+            "locales": len(state["by_locale"]),
+            "source": state["source"],
+            "age_seconds": round(time.time() - state["fetched_at"], 1) if state["fetched_at"] else None,
+            "stale": self.is_stale(),
+        }
@@ -0,0 +1,183 @@
+import struct
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import miniaudio
+except ImportError:  # WAV output is unavailable without it; MP3 output does not need it
+    miniaudio = None
+
+from captions import TICKS_PER_SECOND
+from text_analysis import SLIDE_PAUSE, SENTENCE_END_RE
+
+# PCM layout of the WAV output (the upstream MP3 is 24 kHz mono)
+SAMPLE_RATE = 24000
+CHANNELS = 1
+SAMPLE_WIDTH = 2
+FRAME_BYTES = CHANNELS * SAMPLE_WIDTH
+
+# RIFF sizes for a stream whose length is not known yet (players read to EOF)
+STREAMING_SIZE = 0xFFFFFFFF
+
+SENTENCE_END_CHARS = ".?!"
+
+# one second of silence, sliced for every pause instead of allocating per pause
+_SILENCE = bytes(SAMPLE_RATE * FRAME_BYTES)
+
+
+def decoder_available() -> bool:
+    return miniaudio is not None
+
+
+def wav_header(data_bytes: Optional[int] = None) -> bytes:
+    """44-byte PCM WAV header; `None` writes the open-ended streaming sizes."""
+    if data_bytes is None:
+        riff_size = data_size = STREAMING_SIZE
+    else:
+        riff_size, data_size = 36 + data_bytes, data_bytes
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        riff_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        CHANNELS,
+        SAMPLE_RATE,
+        SAMPLE_RATE * FRAME_BYTES,
+        FRAME_BYTES,
+        SAMPLE_WIDTH * 8,
+        b"data",
+        data_size,
+    )
+
+
+def iter_silence(seconds: float) -> Iterator[memoryview]:
+    """`seconds` of silence as slices of the shared silence block."""
+    remaining = int(round(seconds * SAMPLE_RATE)) * FRAME_BYTES
+    view = memoryview(_SILENCE)
+    while remaining > 0:
+        n = min(remaining, len(_SILENCE))
+        yield view[:n]
+        remaining -= n
+
+
+def pause_points(text: str, sentence_pause: float, slide_pause: float) -> Tuple[str, List[Tuple[int, float]]]:
+    """Text sent upstream for a chunk plus its pauses as (position, seconds).
+
+    The text is `prepare_text_for_chunk(chunk).strip()`; positions index into
+    it. Sentence gaps get `sentence_pause`, each slide-pause token
+    `slide_pause` (a token after a sentence end gets both, as /estimate charges).
+    """
+    pieces = text.split(SLIDE_PAUSE)
+    spoken = " ".join(pieces)
+    lead = len(spoken) - len(spoken.lstrip())
+    stripped = spoken.strip()
+
+    def clamp(pos: int) -> int:
+        return min(max(0, pos - lead), len(stripped))
+
+    # gaps are found before stripping so "end. __SLIDE_PAUSE__" keeps its sentence pause
+    points = [(clamp(m.start()), sentence_pause) for m in SENTENCE_END_RE.finditer(spoken)]
+    pos = 0
+    for piece in pieces[:-1]:
+        pos += len(piece)
+        points.append((clamp(pos), slide_pause))
+        pos += 1
+    points.sort(key=lambda point: point[0])
+    return stripped, points
+
+
+def ends_sentence(text: str) -> bool:
+    """True when a chunk ends on sentence punctuation (a sentence gap follows it in the script)."""
+    return text.rstrip().endswith(tuple(SENTENCE_END_CHARS)) and not text.rstrip().endswith(SLIDE_PAUSE)
+
+
+def word_positions(text: str, words: List[list]) -> List[Tuple[int, float, float]]:
+    """Place upstream words ([offset, duration, text] in ticks) in `text`: (position, start, end) in seconds.
+
+    Words are matched left to right; a word not found (e.g. normalized by the
+    voice) is skipped.
+    """
+    placed = []
+    cursor = 0
+    for offset, duration, word in words:
+        pos = text.find(word, cursor) if word else -1
+        if pos < 0:
+            continue
+        start = offset / TICKS_PER_SECOND
+        placed.append((pos, start, start + duration / TICKS_PER_SECOND))
+        cursor = pos + len(word)
+    return placed
+
+
+def pause_times(points: List[Tuple[int, float]], words: List[Tuple[int, float, float]], duration: float) -> List[Tuple[float, float]]:
+    """Turn text pauses into (time, seconds) within the chunk audio.
+
+    A pause lands midway through the natural gap between the last word before
+    it and the first word after it; before any word it starts the chunk, after
+    every word it ends it.
+    """
+    times = []
+    i = 0
+    for pos, seconds in points:
+        while i < len(words) and words[i][0] < pos:
+            i += 1
+        if i == 0:
+            at = 0.0
+        elif i == len(words):
+            at = duration
+        else:
+            at = (words[i - 1][2] + words[i][1]) / 2.0
+        times.append((min(max(0.0, at), duration), seconds))
+    return times
+
+
+class PcmDecoder:
+    """Gathers one chunk's MP3 at a time and decodes it to 16-bit PCM at the output rate.
+
+    The gathering buffer is reused for every chunk.
+    """
+
+    def __init__(self):
+        if miniaudio is None:
+            raise RuntimeError("WAV output needs the miniaudio package")
+        self._mp3 = bytearray()
+
+    def feed(self, data: bytes) -> None:
+        self._mp3 += data
+
+    def take(self) -> bytes:
+        """The MP3 fed since the last call (one finished chunk)."""
+        data = bytes(self._mp3)
+        self._mp3.clear()
+        return data
+
+    @staticmethod
+    def decode(mp3: bytes) -> memoryview:
+        if not mp3:
+            return memoryview(b"")
+        decoded = miniaudio.decode(
+            mp3,
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=CHANNELS,
+            sample_rate=SAMPLE_RATE,
+        )
+        return memoryview(decoded.samples).cast("B")
+
+
+def pcm_seconds(pcm: memoryview) -> float:
+    return len(pcm) / (SAMPLE_RATE * FRAME_BYTES)
+
+
+def splice_pauses(pcm: memoryview, pauses: List[Tuple[float, float]]) -> Iterator[memoryview]:
+    """Yield chunk PCM with silence inserted at each (time, seconds) pause, in order."""
+    cursor = 0
+    for at, seconds in pauses:
+        cut = min(len(pcm), int(round(at * SAMPLE_RATE)) * FRAME_BYTES)
+        if cut > cursor:
+            yield pcm[cursor:cut]
+            cursor = cut
+        yield from iter_silence(seconds)
+    if cursor < len(pcm):
+        yield pcm[cursor:]